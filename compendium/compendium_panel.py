@@ -115,13 +115,14 @@ class CompendiumPanel(QWidget):
                     if DEBUG:
                         print("Conversion complete. Data saved in new format.")
                 
+                category_brush = QBrush(ThemeManager.get_category_background_color())
                 for cat in data.get("categories", []):
                     cat_item = QTreeWidgetItem(self.tree, [cat.get("name", "Unnamed Category")])
                     cat_item.setData(0, Qt.UserRole, "category")
                     # Mark as category for stylesheet
                     cat_item.setData(0, Qt.ItemDataRole.UserRole + 1, "true")  # Custom property for is-category
                     # Set background color from ThemeManager
-                    cat_item.setBackground(0, QBrush(ThemeManager.get_category_background_color()))
+                    cat_item.setBackground(0, category_brush)
                     cat_item.setFont(0, bold_font)  # Apply bold font
                     for entry in cat.get("entries", []):
                         entry_item = QTreeWidgetItem(cat_item, [entry.get("name", "Unnamed Entry")])
@@ -24,7 +24,7 @@ def assemble_final_prompt(prompt_config, user_input, additional_vars=None, curre
     prompt_text = prompt_config.get("text", "Write a story chapter based on the following user input")
     expected_vars = prompt_config.get("variables", [])  # e.g., ["pov", "tense"]
 
-    # Base template structure
+    # Base template structure; keep "### User" after the stable sections (see PROMPT_CACHE_BREAK in llm_api_aggregator)
     base_template = """
     ### System
     {system_prompt}
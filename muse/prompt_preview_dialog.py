@@ -4,7 +4,6 @@ from PyQt5.QtGui import QFont, QKeySequence
 from PyQt5.QtWidgets import QShortcut
 from settings.theme_manager import ThemeManager
 import muse.prompt_handler as prompt_handler
-import tiktoken
 
 class PromptPreviewDialog(QDialog):
     def __init__(self, controller, conversation_payload=None, prompt_config=None, user_input=None, 
@@ -33,6 +32,7 @@ class PromptPreviewDialog(QDialog):
         self.tree.setHeaderHidden(True)
         self.tree.setColumnCount(2)  # Column 0 for header, Column 1 for content widget
         self.tree.setColumnWidth(0, 200)  # Fixed width for headers
+        self.tree.itemExpanded.connect(self.on_item_expanded)
         self.populate_tree()
         layout.addWidget(self.tree)
 
@@ -84,39 +84,50 @@ class PromptPreviewDialog(QDialog):
             )
             sections = self.parse_prompt_sections(self.final_prompt_text)
 
-        for header, content in sections.items():
-            # Create a top-level item for the header
-            header_item = QTreeWidgetItem(self.tree)
-            header_item.setText(0, header)
-            header_item.setFont(0, QFont("Arial", self.font_size, QFont.Bold))
-
-            # Create a child item to hold the QTextEdit
-            content_item = QTreeWidgetItem(header_item)
-            text_edit = QTextEdit()
-            text_edit.setReadOnly(True)
-            text_edit.setPlainText(content)
-            text_edit.setFont(QFont("Arial", self.font_size))
-            text_edit.setStyleSheet("QTextEdit { border: 1px solid #ccc; padding: 4px; }")  # Add boundary box
-            self.tree.setItemWidget(content_item, 1, text_edit)
-
-            # Collapse if content is long (>300 chars)
-            if len(content.strip()) > 300:
-                header_item.setExpanded(False)
-            else:
-                header_item.setExpanded(True)
-
-        # Adjust tree after adding widgets
-        self.tree.expandAll()  # Expand all initially, then collapse long sections
-        for i in range(self.tree.topLevelItemCount()):
-            item = self.tree.topLevelItem(i)
-            text_edit = self.tree.itemWidget(item.child(0), 1)
-            content_length = len(text_edit.toPlainText().strip())
-            maxheight = min(max(2, int(content_length / 50)), 50) * 30
-            text_edit.setMaximumHeight(maxheight)  # Ensure visibility
-
-            if content_length > 300:
-                item.setExpanded(False)
-            # Resize the content column to fit the widget
+        self.build_fonts()
+        # Build every section before the tree lays out or repaints anything
+        self.tree.setUpdatesEnabled(False)
+        self.tree.blockSignals(True)
+        try:
+            for header, content in sections.items():
+                # Create a top-level item for the header
+                header_item = QTreeWidgetItem(self.tree)
+                header_item.setText(0, header)
+                header_item.setFont(0, self.header_font)
+
+                # Create a child item to hold the QTextEdit
+                content_item = QTreeWidgetItem(header_item)
+                content_item.setData(1, Qt.UserRole, content)
+
+                # Collapse if content is long (>300 chars); its QTextEdit is built on first expand
+                if len(content.strip()) <= 300:
+                    self.create_section_editor(content_item)
+                    header_item.setExpanded(True)
+
+            # Resize the content column to fit the widgets once, not per section
+            self.tree.resizeColumnToContents(1)
+        finally:
+            self.tree.blockSignals(False)
+            self.tree.setUpdatesEnabled(True)
+
+    def create_section_editor(self, content_item):
+        """Build the read-only QTextEdit showing a section's content."""
+        content = content_item.data(1, Qt.UserRole)
+        text_edit = QTextEdit()
+        text_edit.setReadOnly(True)
+        text_edit.setPlainText(content)
+        text_edit.setFont(self.content_font)
+        text_edit.setStyleSheet("QTextEdit { border: 1px solid #ccc; padding: 4px; }")  # Add boundary box
+        maxheight = min(max(2, int(len(content.strip()) / 50)), 50) * 30
+        text_edit.setMaximumHeight(maxheight)  # Ensure visibility
+        self.tree.setItemWidget(content_item, 1, text_edit)
+        return text_edit
+
+    def on_item_expanded(self, header_item):
+        """Build a collapsed section's editor the first time it is opened."""
+        content_item = header_item.child(0)
+        if content_item is not None and self.tree.itemWidget(content_item, 1) is None:
+            self.create_section_editor(content_item)
             self.tree.resizeColumnToContents(1)
 
     def parse_conversation_payload(self):
@@ -171,20 +182,27 @@ class PromptPreviewDialog(QDialog):
             self.font_size -= 2
             self.update_font_size()
 
+    def build_fonts(self):
+        """Create the header and content fonts for the current size, shared by every row."""
+        self.header_font = QFont("Arial", self.font_size, QFont.Bold)
+        self.content_font = QFont("Arial", self.font_size)
+
     def update_font_size(self):
         """Apply the current font size to all tree items and widgets."""
+        self.build_fonts()
         for i in range(self.tree.topLevelItemCount()):
             header_item = self.tree.topLevelItem(i)
-            header_item.setFont(0, QFont("Arial", self.font_size, QFont.Bold))
+            header_item.setFont(0, self.header_font)
             content_widget = self.tree.itemWidget(header_item.child(0), 1)
             if content_widget:
-                content_widget.setFont(QFont("Arial", self.font_size))
+                content_widget.setFont(self.content_font)
         # Update token count label font size
-        self.token_count_label.setFont(QFont("Arial", self.font_size))
+        self.token_count_label.setFont(self.content_font)
 
     def update_token_count(self):
         """Calculate and display the token count using tiktoken."""
         try:
+            import tiktoken  # Deferred so importing this dialog stays cheap
             encoding = tiktoken.get_encoding("cl100k_base")  # Use a common encoding, e.g., for GPT models
             tokens = encoding.encode(self.final_prompt_text)
             token_count = len(tokens)
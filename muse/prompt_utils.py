@@ -1,5 +1,7 @@
 import json
 import os
+import shutil
+from pathlib import Path
 from typing import Dict, List, Optional
 
 from settings.settings_manager import WWSettingsManager
@@ -58,12 +60,33 @@ def load_prompts(style: Optional[str] = None) -> Dict[str, List[Dict]]:
         return {} if not style else [get_default_prompt(style)]
 
 def save_prompts(prompts_data: Dict[str, List[Dict]], prompts_file: str, backup_file: str) -> bool:
-    """Save prompts to the specified file and create a backup."""
+    """Save prompts to the specified file, keeping the previous version as the backup.
+
+    The data is serialized once and written to a temporary file which is then
+    swapped in with os.replace, so an interrupted save never leaves a partial file.
+    """
+    tmp_file = prompts_file + ".tmp"
     try:
-        with open(prompts_file, "w", encoding="utf-8") as f:
-            json.dump(prompts_data, f, indent=4)
-        with open(backup_file, "w", encoding="utf-8") as f:
-            json.dump(prompts_data, f, indent=4)
+        data_bytes = json.dumps(prompts_data, indent=4, ensure_ascii=False).encode("utf-8")
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(data_bytes)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        if os.path.exists(prompts_file):
+            # prompts.json stays in place throughout; the backup is a second name for the old file
+            try:
+                os.unlink(backup_file)
+            except FileNotFoundError:
+                pass
+            try:
+                os.link(prompts_file, backup_file)
+            except OSError:
+                shutil.copy2(prompts_file, backup_file)  # Filesystem without hard links
+        os.replace(tmp_file, prompts_file)
         return True
     except Exception as e:
         print(f"Error saving prompts: {e}")
@@ -80,8 +103,8 @@ def _load_prompt_style(style: Optional[str]) -> Dict[str, List[Dict]]:
             os.rename(oldpath, filepath)
     
     if os.path.exists(filepath):
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        # One read of the raw bytes; json decodes UTF-8 itself
+        data = json.loads(Path(filepath).read_bytes())
     
     if style:
         return data.get(style, [])
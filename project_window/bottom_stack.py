@@ -12,6 +12,16 @@ from .summary_model import SummaryModel
 from muse.prompt_panel import PromptPanel
 from muse.prompt_preview_dialog import PromptPreviewDialog
 
+_LLM_ICON_PATHS = (
+    "assets/icons/save.svg",
+    "assets/icons/eye.svg",
+    "assets/icons/send.svg",
+    "assets/icons/x-octagon.svg",
+    "assets/icons/book.svg",
+    "assets/icons/book-open.svg",
+)
+ThemeManager.preload_icons(_LLM_ICON_PATHS)
+
 class BottomStack(QWidget):
     """Stacked widget for summary and LLM panels."""
     def __init__(self, controller, model, tint_color=QColor("black")):
@@ -19,6 +29,7 @@ class BottomStack(QWidget):
         self.controller = controller
         self.model = model
         self.tint_color = tint_color
+        self._context_panel = None  # Built on first use; see context_panel
         self.stack = QStackedWidget()
         self.scene_editor = controller.scene_editor
         self.summary_controller = SummaryController(
@@ -108,14 +119,10 @@ class BottomStack(QWidget):
         self.preview_text.setReadOnly(True)
         self.preview_text.setPlaceholderText(_("LLM output preview will appear here..."))
         preview_buttons = QHBoxLayout()
-        self.apply_button = QPushButton()
-        self.apply_button.setIcon(ThemeManager.get_tinted_icon("assets/icons/save.svg", self.tint_color))
-        self.apply_button.setToolTip(_("Appends the LLM's output to your current scene"))
-        self.apply_button.clicked.connect(self.controller.apply_preview)
+        self.apply_button = self.add_tool_button(preview_buttons, "assets/icons/save.svg", _("Appends the LLM's output to your current scene"), self.controller.apply_preview)
         self.include_prompt_checkbox = QCheckBox(_("Include Action Beats"))
         self.include_prompt_checkbox.setToolTip(_("Include the text from the Action Beats field in the scene text"))
         self.include_prompt_checkbox.setChecked(True)
-        preview_buttons.addWidget(self.apply_button)
         preview_buttons.addWidget(self.include_prompt_checkbox)
         preview_buttons.addStretch()
 
@@ -136,30 +143,10 @@ class BottomStack(QWidget):
         self.prose_prompt_panel.setMaximumWidth(300)
         buttons_layout.addWidget(self.prose_prompt_panel)
 
-        self.preview_button = QPushButton()
-        self.preview_button.setIcon(ThemeManager.get_tinted_icon("assets/icons/eye.svg", self.tint_color))
-        self.preview_button.setToolTip(_("Preview the final prompt"))
-        self.preview_button.clicked.connect(self.preview_prompt)
-        buttons_layout.addWidget(self.preview_button)
-
-        self.send_button = QPushButton()
-        self.send_button.setIcon(ThemeManager.get_tinted_icon("assets/icons/send.svg", self.tint_color))
-        self.send_button.setToolTip(_("Sends the action beats to the LLM"))
-        self.send_button.clicked.connect(self.controller.send_prompt)
-        buttons_layout.addWidget(self.send_button)
-
-        self.stop_button = QPushButton()
-        self.stop_button.setIcon(ThemeManager.get_tinted_icon("assets/icons/x-octagon.svg", self.tint_color))
-        self.stop_button.setToolTip(_("Stop the LLM processing"))
-        self.stop_button.clicked.connect(self.controller.stop_llm)
-        buttons_layout.addWidget(self.stop_button)
-
-        self.context_toggle_button = QPushButton()
-        self.context_toggle_button.setIcon(ThemeManager.get_tinted_icon("assets/icons/book.svg", self.tint_color))
-        self.context_toggle_button.setToolTip(_("Toggle context panel"))
-        self.context_toggle_button.setCheckable(True)
-        self.context_toggle_button.clicked.connect(self.toggle_context_panel)
-        buttons_layout.addWidget(self.context_toggle_button)
+        self.preview_button = self.add_tool_button(buttons_layout, "assets/icons/eye.svg", _("Preview the final prompt"), self.preview_prompt)
+        self.send_button = self.add_tool_button(buttons_layout, "assets/icons/send.svg", _("Sends the action beats to the LLM"), self.controller.send_prompt)
+        self.stop_button = self.add_tool_button(buttons_layout, "assets/icons/x-octagon.svg", _("Stop the LLM processing"), self.controller.stop_llm)
+        self.context_toggle_button = self.add_tool_button(buttons_layout, "assets/icons/book.svg", _("Toggle context panel"), self.toggle_context_panel, checkable=True)
 
         buttons_layout.addStretch()
         pulldown_widget = QWidget()
@@ -173,22 +160,36 @@ class BottomStack(QWidget):
         buttons_layout.addWidget(pulldown_widget)
 
         left_layout.addLayout(buttons_layout)
-        splitter = QSplitter(Qt.Horizontal)
-        splitter.addWidget(left_container)
-
-        self.context_panel = ContextPanel(self.model.structure, self.model.project_name, self.controller, enhanced_window=self.controller.enhanced_window)
-        self.context_panel.setVisible(False)
-        splitter.addWidget(self.context_panel)
-        splitter.setSizes([500, 300])
+        self.context_splitter = QSplitter(Qt.Horizontal)
+        self.context_splitter.addWidget(left_container)
 
         left_container.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Maximum)
-        action_layout.addWidget(splitter)
+        action_layout.addWidget(self.context_splitter)
 
         layout.addWidget(self.preview_text)
         layout.addLayout(preview_buttons)
         layout.addLayout(action_layout)
         return panel
 
+    @property
+    def context_panel(self):
+        """The context panel, built the first time it is shown or its selection is read."""
+        if self._context_panel is None:
+            self._context_panel = ContextPanel(self.model.structure, self.model.project_name, self.controller, enhanced_window=self.controller.enhanced_window)
+            self._context_panel.setVisible(False)
+            self.context_splitter.addWidget(self._context_panel)
+            self.context_splitter.setSizes([500, 300])
+        return self._context_panel
+
+    def add_tool_button(self, layout, icon_path, tooltip, callback, checkable=False):
+        button = QPushButton()
+        button.setIcon(ThemeManager.get_tinted_icon(icon_path, self.tint_color))
+        button.setToolTip(tooltip)
+        button.setCheckable(checkable)
+        button.clicked.connect(callback)
+        layout.addWidget(button)
+        return button
+
     def add_combo(self, layout, label_text, items, callback):
         combo = QComboBox()
         combo.addItems(items)
@@ -202,7 +203,7 @@ class BottomStack(QWidget):
         self.send_button.setIcon(ThemeManager.get_tinted_icon("assets/icons/send.svg", tint_color))
         self.stop_button.setIcon(ThemeManager.get_tinted_icon("assets/icons/x-octagon.svg", tint_color))
         self.context_toggle_button.setIcon(ThemeManager.get_tinted_icon(
-            "assets/icons/book-open.svg" if self.context_panel.isVisible() else "assets/icons/book.svg", tint_color))
+            "assets/icons/book-open.svg" if self._context_panel is not None and self._context_panel.isVisible() else "assets/icons/book.svg", tint_color))
         self.summary_preview_button.setIcon(ThemeManager.get_tinted_icon("assets/icons/eye.svg", tint_color))
         self.summary_start_button.setIcon(ThemeManager.get_tinted_icon("assets/icons/play-circle.svg", tint_color))
         self.delete_summary_button.setIcon(ThemeManager.get_tinted_icon("assets/icons/trash.svg", tint_color))
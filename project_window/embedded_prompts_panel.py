@@ -1,13 +1,13 @@
 import os
 import uuid
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QSplitter, QTreeWidget, QTreeWidgetItem,
     QTextEdit, QPushButton, QMenu, QInputDialog, QMessageBox, QLabel, QComboBox,
-    QSpinBox, QDoubleSpinBox, QApplication, QHeaderView
+    QSpinBox, QDoubleSpinBox, QHeaderView, QToolTip
 )
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, QEvent, QObject, QRunnable, QThreadPool, QSignalBlocker, pyqtSignal
 from PyQt5.QtGui import QFont, QBrush
 from muse.prompt_utils import get_prompt_categories, load_prompts, get_default_prompt, save_prompts
 from settings.llm_api_aggregator import WWApiAggregator
@@ -36,13 +36,49 @@ class CustomTextEdit(QTextEdit):
             self.panel._apply_pending_changes()
         super().hideEvent(event)
 
+_TOOLTIP_LINES = (
+    "Provider: {provider}",
+    "Model: {model}",
+    "Max Tokens: {max_tokens}",
+    "Temperature: {temperature}",
+    "Text: {text}",
+)
+_DEFAULT_TOOLTIP_NOTE = "Default prompt (read-only): Uses default LLM settings."
+
+class ModelFetchSignals(QObject):
+    """Signals emitted by ModelFetchTask; QRunnable itself cannot emit."""
+    modelsFetched = pyqtSignal(list, object, str)  # models, error message, provider name
+
+class ModelFetchTask(QRunnable):
+    """Fetch a provider's model list on the global thread pool."""
+    def __init__(self, provider_name: str, do_refresh: bool):
+        super().__init__()
+        self.provider_name = provider_name
+        self.do_refresh = do_refresh
+        self.signals = ModelFetchSignals()
+
+    def run(self):
+        try:
+            provider = WWApiAggregator.aggregator.get_provider(self.provider_name)
+            models = provider.get_available_models(self.do_refresh)
+            self.signals.modelsFetched.emit(list(models), None, self.provider_name)
+        except Exception as e:
+            self.signals.modelsFetched.emit([], _("Error fetching models: {}").format(str(e)), self.provider_name)
+
 class EmbeddedPromptsPanel(QWidget):
     """Panel for managing prompts in the main window's sidebar and editor."""
     
     SAVE_DELAY = 7000  # wait time (microseconds) before saving a user edit
+    FLUSH_DELAY = 250  # wait time (milliseconds) to coalesce writes of prompts.json
+    ROLE_TOOLTIP = Qt.UserRole + 2  # Cached tooltip text; UserRole + 1 marks category items
+    _EDITABLE_FIELDS = ("text", "provider", "model", "max_tokens", "temperature")
+    _BOLD_FONT: Optional[QFont] = None  # Shared by all category items; built once a QApplication exists
     
     def __init__(self, project_name: str, controller, parent: Optional[QWidget] = None):
         super().__init__(parent)
+        if EmbeddedPromptsPanel._BOLD_FONT is None:
+            EmbeddedPromptsPanel._BOLD_FONT = QFont()
+            EmbeddedPromptsPanel._BOLD_FONT.setBold(True)
         self.project_name = project_name
         self.controller = controller
         self.prompts_file = WWSettingsManager.get_project_path(file="prompts.json")
@@ -52,12 +88,24 @@ class EmbeddedPromptsPanel(QWidget):
         self.pending_changes: Dict[str, Dict] = {}  # Store pending changes by prompt ID
         self.selected_model: Optional[str] = None
         self.pending_model: Optional[str] = None
+        self._save_requested = False  # prompts_data changed outside pending_changes
+        self._provider_info_dialog: Optional[ProviderInfoDialog] = None
+        self._prompt_items: Dict[str, QTreeWidgetItem] = {}
+        self._active_llm_cache: Optional[Tuple[str, str]] = None
+        self._models_cache: Dict[str, List[str]] = {}  # Model lists by provider name
+        self._models_loading: Optional[str] = None  # Provider whose model list is being fetched
+        self._provider_display_cache: Dict[str, str] = {}  # Rebuilt whenever provider_combo is repopulated
         
         self.save_timer = QTimer(self)
         self.save_timer.setSingleShot(True)
         self.save_timer.setInterval(self.SAVE_DELAY)
         self.save_timer.timeout.connect(self._apply_pending_changes)
         
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.FLUSH_DELAY)
+        self._flush_timer.timeout.connect(self._flush_to_file)
+        
         self.init_ui()
         self.load_prompts()
         self.tree.expandAll()
@@ -99,6 +147,7 @@ class EmbeddedPromptsPanel(QWidget):
         self.tree.customContextMenuRequested.connect(self._on_tree_context_menu)
         self.tree.setIndentation(5)
         self.tree.currentItemChanged.connect(self._on_current_item_changed)
+        self.tree.viewport().installEventFilter(self)  # Prompt tooltips are built on demand
         
         tree_layout.addWidget(self.tree)
         self.splitter.addWidget(self.tree_widget)
@@ -216,6 +265,7 @@ class EmbeddedPromptsPanel(QWidget):
     def update_provider_list(self) -> None:
         """Update the provider combo box with available LLM providers."""
         self.provider_combo.clear()
+        self._reset_active_llm()
         self.llm_configs = WWSettingsManager.get_llm_configs()
         self.active_config = WWSettingsManager.get_active_llm_name()
         
@@ -226,16 +276,32 @@ class EmbeddedPromptsPanel(QWidget):
                 self.provider_combo.setCurrentText(display_name)
         
         self.provider_combo.currentTextChanged.connect(self._on_provider_changed)
+        self._provider_display_cache.clear()
 
     def _get_provider_display_name(self, provider: str) -> str:
         """Get the display name for a provider as stored in provider_combo."""
-        for i in range(self.provider_combo.count()):
-            if self.provider_combo.itemData(i) == provider:
-                return self.provider_combo.itemText(i)
-        return provider  # Fallback to provider name if not found
+        if not self._provider_display_cache:
+            # Index the whole combo once instead of scanning per lookup
+            for i in range(self.provider_combo.count()):
+                self._provider_display_cache.setdefault(self.provider_combo.itemData(i), self.provider_combo.itemText(i))
+        return self._provider_display_cache.get(provider, provider)  # Fallback to provider name if not found
+
+    def _reset_active_llm(self) -> None:
+        """Forget the cached active LLM and the tooltips that were built from it."""
+        self._active_llm_cache = None
+        for item in self._prompt_items.values():
+            self._invalidate_tooltip(item)
+
+    def _get_active_llm(self) -> Tuple[str, str]:
+        """Return the active LLM name and model, cached until the provider list changes."""
+        if self._active_llm_cache is None:
+            active_config = WWSettingsManager.get_active_llm_config() or {}
+            self._active_llm_cache = (WWSettingsManager.get_active_llm_name(), active_config.get("model", ""))
+        return self._active_llm_cache
 
     def _on_provider_changed(self, provider_text: str) -> None:
         """Handle provider combo box changes."""
+        self._reset_active_llm()
         self._refresh_models(use_cache=True)
         self._update_pending_changes()
         self.save_timer.start()
@@ -247,27 +313,59 @@ class EmbeddedPromptsPanel(QWidget):
             return
         
         provider_name = self.provider_combo.itemData(current_index)
+        if use_cache and provider_name in self._models_cache:
+            self._on_models_updated(self._models_cache[provider_name], None)
+            return
+        if use_cache and self._models_loading == provider_name:
+            return  # Already on its way; _on_models_updated applies pending_model
+        
         if not use_cache:
+            self._models_cache.pop(provider_name, None)
+            if self.pending_model is None:
+                self.pending_model = self.model_combo.currentText()  # Keep the selection across a refresh
+        self._models_loading = provider_name
+        with QSignalBlocker(self.model_combo):
             self.model_combo.clear()
             self.model_combo.addItem(_("Loading models..."))
-            self.model_combo.setEnabled(False)
-            self.refresh_button.setEnabled(False)
-            QApplication.processEvents()
-        
-        try:
-            provider = WWApiAggregator.aggregator.get_provider(provider_name)
-            models = provider.get_available_models(not use_cache)
-            self._on_models_updated(models, None)
-        except Exception as e:
-            self._on_models_updated([], _("Error fetching models: {}").format(str(e)))
+        self.model_combo.setEnabled(False)
+        self.refresh_button.setEnabled(False)
+        
+        task = ModelFetchTask(provider_name, not use_cache)
+        task.signals.modelsFetched.connect(self._on_models_fetched, Qt.QueuedConnection)
+        QThreadPool.globalInstance().start(task)
+
+    def _on_models_fetched(self, models: List[str], error_msg: Optional[str], provider_name: str) -> None:
+        """Receive a model list fetched in the background."""
+        if provider_name != self.provider_combo.currentData():
+            # The selection moved on while fetching; keep the result for later
+            if not error_msg:
+                self._models_cache[provider_name] = models
+            return
+        self._on_models_updated(models, error_msg, provider_name)
 
-    def _on_models_updated(self, models: List[str], error_msg: Optional[str]) -> None:
+    def _on_models_updated(self, models: List[str], error_msg: Optional[str], provider_name: Optional[str] = None) -> None:
         """Update the model combo box with available models."""
-        self.model_combo.clear()
-        self.model_combo.addItems(models)
-        self.model_combo.addItem(_("Custom..."))
-        self.model_combo.setEnabled(True)
-        self.refresh_button.setEnabled(True)
+        if provider_name is not None and not error_msg:
+            self._models_cache[provider_name] = list(models)
+        self._models_loading = None
+        
+        # Repopulating is not an edit; only a user's provider switch below records the new model
+        user_switch = self.pending_model is None
+        with QSignalBlocker(self.model_combo):
+            self.model_combo.clear()
+            self.model_combo.addItems(models)
+            self.model_combo.addItem(_("Custom..."))
+            if self.pending_model:
+                idx = self.model_combo.findText(self.pending_model)
+                if idx == -1:
+                    # Keep the saved model even if the list is unavailable or no longer offers it
+                    idx = len(models)
+                    self.model_combo.insertItem(idx, self.pending_model)
+                self.model_combo.setCurrentIndex(idx)
+            self.pending_model = None
+        editable = not self.editor.isReadOnly()  # Default prompts keep their parameters locked
+        self.model_combo.setEnabled(editable)
+        self.refresh_button.setEnabled(editable)
         
         if error_msg:
             self.status_label.setText(error_msg)
@@ -275,11 +373,8 @@ class EmbeddedPromptsPanel(QWidget):
         else:
             self.status_label.hide()
         
-        if self.pending_model:
-            idx = self.model_combo.findText(self.pending_model)
-            if idx != -1:
-                self.model_combo.setCurrentIndex(idx)
-            self.pending_model = None
+        if user_switch and provider_name is not None and models:
+            self._on_parameter_changed()  # The fetch finished after the provider change was recorded
 
     def load_prompts(self) -> None:
         """Load and validate prompts, ensuring IDs are present."""
@@ -301,45 +396,63 @@ class EmbeddedPromptsPanel(QWidget):
                         id_added = True
         
         if id_added:
-            self._save_to_file()
+            self._request_save()  # Not needed before the window is shown
         
+        self.tree.setUpdatesEnabled(False)
+        self.tree.blockSignals(True)
+        try:
+            self._build_tree()
+        finally:
+            self.tree.blockSignals(False)
+            self.tree.setUpdatesEnabled(True)
+
+    def _build_tree(self) -> None:
+        """Build the prompt tree from scratch."""
         self.tree.clear()
-        bold_font = QFont()
-        bold_font.setBold(True)
-        
+        self._prompt_items.clear()
         for cat in sorted(self.prompts_data.keys()):
-            parent = QTreeWidgetItem(self.tree, [cat])
-            parent.setData(0, Qt.UserRole, {"type": "category", "name": cat})
-            parent.setData(0, Qt.ItemDataRole.UserRole + 1, "true")  # Custom property for is-category
-            parent.setBackground(0, QBrush(ThemeManager.get_category_background_color()))
-            parent.setFont(0, bold_font)
-            parent.setFlags(parent.flags() & ~Qt.ItemIsSelectable)
-            plus_button = QPushButton(self.tree)
-            plus_button.setIcon(ThemeManager.get_tinted_icon("assets/icons/plus.svg"))
-            plus_button.setFlat(True)
-            plus_button.setMaximumSize(24, 24)
-            plus_button.clicked.connect(lambda _, it=parent: self._add_new_prompt(it))
-            self.tree.setItemWidget(parent, 1, plus_button)
-            
+            parent = self._create_category_item(cat)
             for prompt in self.prompts_data[cat]:
-                child = QTreeWidgetItem(parent, [prompt["name"]])
-                child.setData(0, Qt.UserRole, prompt)
-                child.setToolTip(0, self._create_prompt_tooltip(prompt))
+                self._create_prompt_item(parent, prompt)
+
+    def _create_category_item(self, cat: str) -> QTreeWidgetItem:
+        """Create a top-level category item with its add-prompt button."""
+        parent = QTreeWidgetItem(self.tree, [cat])
+        parent.setData(0, Qt.UserRole, {"type": "category", "name": cat})
+        parent.setData(0, Qt.ItemDataRole.UserRole + 1, "true")  # Custom property for is-category
+        parent.setBackground(0, QBrush(ThemeManager.get_category_background_color()))
+        parent.setFont(0, EmbeddedPromptsPanel._BOLD_FONT)
+        parent.setFlags(parent.flags() & ~Qt.ItemIsSelectable)
+        plus_button = QPushButton(self.tree)
+        plus_button.setIcon(ThemeManager.get_tinted_icon("assets/icons/plus.svg"))
+        plus_button.setFlat(True)
+        plus_button.setMaximumSize(24, 24)
+        plus_button.setProperty("category_item", parent)
+        plus_button.clicked.connect(self._on_plus_clicked)
+        self.tree.setItemWidget(parent, 1, plus_button)
+        return parent
+
+    def _create_prompt_item(self, parent: QTreeWidgetItem, prompt: Dict) -> QTreeWidgetItem:
+        """Create a prompt item under the given category item."""
+        child = QTreeWidgetItem(parent, [prompt["name"]])
+        child.setData(0, Qt.UserRole, prompt)
+        self._prompt_items[prompt.get("id")] = child
+        return child
+
+    def _forget_prompt_item(self, item: QTreeWidgetItem) -> None:
+        """Drop a prompt item from the id lookup before it leaves the tree."""
+        data = item.data(0, Qt.UserRole) or {}
+        self._prompt_items.pop(data.get("id"), None)
+        if item is self.current_prompt_item:
+            self.current_prompt_item = None
 
     def _on_current_item_changed(self, current: QTreeWidgetItem, previous: QTreeWidgetItem) -> None:
         """Handle tree item selection changes."""
-        def _setCurrentItem(tree: QTreeWidget, item: QTreeWidgetItem):
-            """You can't change the current item while handling item change"""
-            timer = QTimer(tree)
-            timer.setSingleShot(True)
-            timer.setInterval(0)
-            timer.timeout.connect(lambda: tree.setCurrentItem(item))
-            timer.start()
-
-        # Capture current editor text before switching prompts
+        # Capture current editor text before switching prompts; the save timer writes it
         if self.current_prompt_item:
             self._update_pending_changes()
-        self._apply_pending_changes()  # Save any pending changes before switching
+        if self.pending_changes:
+            self.save_timer.start()
         self.current_prompt_item = current
         self.replicate_button.hide()
         self.parameters_panel.hide()
@@ -349,44 +462,53 @@ class EmbeddedPromptsPanel(QWidget):
         
         data = current.data(0, Qt.UserRole)
         if not data or data.get("type") == "category":
+            # You can't change the current item while handling item change
             if previous:
-                _setCurrentItem(self.tree, previous)
+                QTimer.singleShot(0, lambda it=previous: self.tree.setCurrentItem(it))
             elif current.childCount() > 0:
-                _setCurrentItem(self.tree, current.child(0))
+                QTimer.singleShot(0, lambda it=current.child(0): self.tree.setCurrentItem(it))
             return
         
+        self._load_prompt_into_ui(self.pending_changes.get(data.get("id"), data))
+
+    def _load_prompt_into_ui(self, data: Dict) -> None:
+        """Show a prompt's text and parameters without recording them as edits."""
         is_default = data.get("default", False)
-        self.editor.blockSignals(True)  # We are loading saved data, so this is not an edit
-        self.editor.setPlainText(data.get("text", ""))
-        self.editor.setReadOnly(is_default)
-        self.editor.blockSignals(False)
-        if is_default:
-            self.replicate_button.show()
-        
         # Use SettingsManager for default prompts, otherwise use prompt data
-        active_provider = WWSettingsManager.get_active_llm_name()
-        active_config = WWSettingsManager.get_active_llm_config() or {}
-        active_model = active_config.get("model", "")
-        
+        active_provider, active_model = self._get_active_llm()
         provider = active_provider if is_default else data.get("provider", active_provider)
         model = active_model if is_default else data.get("model", active_model)
-        
         provider_display = self._get_provider_display_name(provider)
-        self.pending_model = model
-        self.provider_combo.setCurrentText(provider_display)
-        current_model = self.model_combo.currentText()
-        if current_model != model:
-            self._refresh_models(True)
-            self.model_combo.setCurrentText(model)
-        
-        self.max_tokens_spin.setValue(data.get("max_tokens", 2000))
-        self.temp_spin.setValue(data.get("temperature", 0.7))
-        
-        self.parameters_panel.setVisible(True)
-        self.provider_combo.setEnabled(not is_default)
-        self.model_combo.setEnabled(not is_default)
-        self.temp_spin.setEnabled(not is_default)
-        self.refresh_button.setEnabled(not is_default)
+        
+        widgets = [self.editor, self.provider_combo, self.model_combo, self.max_tokens_spin, self.temp_spin]
+        self.parameters_panel.setUpdatesEnabled(False)
+        for widget in widgets:
+            widget.blockSignals(True)  # We are loading saved data, so this is not an edit
+        try:
+            self.editor.setPlainText(data.get("text", ""))
+            self.editor.setReadOnly(is_default)
+            if is_default:
+                self.replicate_button.show()
+            
+            provider_changed = self.provider_combo.currentText() != provider_display
+            self.provider_combo.setCurrentText(provider_display)
+            if provider_changed or self.model_combo.currentText() != model:
+                self.pending_model = model  # Selected once the model list is in, possibly after a fetch
+                self._refresh_models(True)
+            
+            self.max_tokens_spin.setValue(data.get("max_tokens", 2000))
+            self.temp_spin.setValue(data.get("temperature", 0.7))
+            
+            self.parameters_panel.setVisible(True)
+            self.provider_combo.setEnabled(not is_default)
+            self.temp_spin.setEnabled(not is_default)
+            if self._models_loading is None:  # Otherwise _on_models_updated enables them
+                self.model_combo.setEnabled(not is_default)
+                self.refresh_button.setEnabled(not is_default)
+        finally:
+            for widget in widgets:
+                widget.blockSignals(False)
+            self.parameters_panel.setUpdatesEnabled(True)
 
     def _on_parameter_changed(self) -> None:
         """Handle changes to provider, model, max tokens, or temperature."""
@@ -418,6 +540,8 @@ class EmbeddedPromptsPanel(QWidget):
             return
         
         data = self.current_prompt_item.data(0, Qt.UserRole)
+        if not data or data.get("type") == "category":
+            return
         prompt_id = data.get("id")
         
         # Create or update pending changes
@@ -435,8 +559,8 @@ class EmbeddedPromptsPanel(QWidget):
             updated = True
         
         new_model = self.model_combo.currentText()
-        if new_model != pending_data.get("model"):
-            pending_data["model"] = new_model
+        if self._models_loading is None and new_model != pending_data.get("model"):
+            pending_data["model"] = new_model  # Not while the combo only holds the loading placeholder
             updated = True
         
         new_max_tokens = self.max_tokens_spin.value()
@@ -451,14 +575,14 @@ class EmbeddedPromptsPanel(QWidget):
         
         if updated:
             self.pending_changes[prompt_id] = pending_data
-            self.current_prompt_item.setToolTip(0, self._create_prompt_tooltip(pending_data))
+            self._invalidate_tooltip(self.current_prompt_item)
 
     def _apply_pending_changes(self) -> None:
         """Apply pending changes to prompts_data and save to file."""
-        if not self.current_prompt_item or not self.pending_changes:
+        if not self.pending_changes and not self._save_requested:
             return
         
-        updated = False
+        updated = self._save_requested
         for prompt_id, pending_data in list(self.pending_changes.items()):  # Copy to avoid mod-during-iter
             # Find the category and prompt index by ID
             category = None
@@ -477,58 +601,100 @@ class EmbeddedPromptsPanel(QWidget):
             
             saved_data = self.prompts_data[category][prompt_index]
             # Check for actual changes
-            if (pending_data.get("text") != saved_data.get("text") or
-                pending_data.get("provider") != saved_data.get("provider") or
-                pending_data.get("model") != saved_data.get("model") or
-                pending_data.get("max_tokens") != saved_data.get("max_tokens") or
-                pending_data.get("temperature") != saved_data.get("temperature")):
-                
-                self.prompts_data[category][prompt_index].update(pending_data)
-                # Update tree item if it's the current (or find it to update tooltip/data)
-                if self.current_prompt_item and self.current_prompt_item.data(0, Qt.UserRole).get("id") == prompt_id:
-                    self.current_prompt_item.setData(0, Qt.UserRole, pending_data.copy())
-                    self.current_prompt_item.setToolTip(0, self._create_prompt_tooltip(pending_data))
+            if any(pending_data.get(key) != saved_data.get(key) for key in self._EDITABLE_FIELDS):
+                # Only the edited fields: the rest of pending_data may predate a rename
+                edits = {key: pending_data[key] for key in self._EDITABLE_FIELDS if key in pending_data}
+                saved_data.update(edits)
+                # Pending changes may belong to a prompt that is no longer selected
+                item = self._prompt_items.get(prompt_id)
+                if item is not None:
+                    item_data = dict(item.data(0, Qt.UserRole) or saved_data)
+                    item_data.update(edits)
+                    item.setData(0, Qt.UserRole, item_data)
+                    self._invalidate_tooltip(item)
                 updated = True
             
             del self.pending_changes[prompt_id]
     
         if updated:
-            self._save_to_file()
+            self._save_requested = False
+            self._flush_timer.start()
 
-    def _update_prompt_in_data(self, category: str, data: Dict) -> None:
-        """Update prompt in prompts_data by ID."""
-        for prompt in self.prompts_data.get(category, []):
-            if prompt.get("id") == data.get("id"):
-                prompt.update(data)
-                break
+    def _request_save(self) -> None:
+        """Write prompts_data on the next save timer tick instead of right away."""
+        self._save_requested = True
+        self.save_timer.start()
 
-    def _save_to_file(self) -> bool:
+    def _category_of(self, item: QTreeWidgetItem) -> str:
+        """Return the category name stored on a prompt item's parent."""
+        return self._category_of_parent(item.parent())
+
+    def _category_of_parent(self, category_item: QTreeWidgetItem) -> str:
+        """Return the category name stored on a category item."""
+        return category_item.data(0, Qt.UserRole)["name"]
+
+    def _prompt_slot(self, item: QTreeWidgetItem) -> Tuple[List[Dict], int]:
+        """Locate a prompt item's entry in prompts_data as (category list, index)."""
+        prompts = self.prompts_data.get(self._category_of(item), [])
+        index = item.parent().indexOfChild(item)
+        prompt_id = item.data(0, Qt.UserRole).get("id")
+        if 0 <= index < len(prompts) and prompts[index].get("id") == prompt_id:
+            return prompts, index  # Tree order mirrors the category list
+        for i, prompt in enumerate(prompts):
+            if prompt.get("id") == prompt_id:
+                return prompts, i
+        return prompts, -1
+
+    def _flush_to_file(self) -> bool:
         """Save prompts_data to file and backup."""
+        self._flush_timer.stop()
         return save_prompts(self.prompts_data, self.prompts_file, self.backup_file)
 
+    def _invalidate_tooltip(self, item: Optional[QTreeWidgetItem]) -> None:
+        """Drop a prompt item's cached tooltip so the next hover rebuilds it."""
+        if item is not None:
+            item.setData(0, self.ROLE_TOOLTIP, None)
+
     def _create_prompt_tooltip(self, prompt: Dict) -> str:
         """Create a tooltip string for a prompt."""
-        if prompt.get("default", False):
-            active_provider = WWSettingsManager.get_active_llm_name()
-            active_config = WWSettingsManager.get_active_llm_config() or {}
-            active_model = active_config.get("model", "Unknown")
-            tooltip = (
-                f"Provider: {active_provider}\n"
-                f"Model: {active_model}\n"
-                f"Max Tokens: {prompt.get('max_tokens', 2000)}\n"
-                f"Temperature: {prompt.get('temperature', 0.7)}\n"
-                f"Text: {prompt.get('text', '')}\n"
-                f"Default prompt (read-only): Uses default LLM settings."
-            )
+        active_provider, active_model = self._get_active_llm()
+        is_default = prompt.get("default", False)
+        if is_default:
+            provider, model = active_provider, active_model or "Unknown"
         else:
-            tooltip = (
-                f"Provider: {prompt.get('provider', WWSettingsManager.get_active_llm_name())}\n"
-                f"Model: {prompt.get('model', WWSettingsManager.get_active_llm_config().get('model', 'Unknown'))}\n"
-                f"Max Tokens: {prompt.get('max_tokens', 2000)}\n"
-                f"Temperature: {prompt.get('temperature', 0.7)}\n"
-                f"Text: {prompt.get('text', '')}"
-            )
-        return tooltip
+            provider = prompt.get("provider", active_provider)
+            model = prompt.get("model")
+            if model is None:
+                model = active_model or "Unknown"
+        prompt_view = {
+            "provider": provider,
+            "model": model,
+            "max_tokens": prompt.get("max_tokens", 2000),
+            "temperature": prompt.get("temperature", 0.7),
+            "text": prompt.get("text", ""),
+        }
+        lines = [line.format_map(prompt_view) for line in _TOOLTIP_LINES]
+        if is_default:
+            lines.append(_DEFAULT_TOOLTIP_NOTE)
+        return "\n".join(lines)
+
+    def eventFilter(self, obj, event) -> bool:
+        """Build prompt tooltips only when the tree actually asks for one."""
+        if event.type() == QEvent.ToolTip and obj is self.tree.viewport():
+            item = self.tree.itemAt(event.pos())
+            data = item.data(0, Qt.UserRole) if item else None
+            if data and data.get("type") != "category":
+                tooltip = item.data(0, self.ROLE_TOOLTIP)
+                if tooltip is None:
+                    prompt = self.pending_changes.get(data.get("id"), data)
+                    tooltip = self._create_prompt_tooltip(prompt)
+                    item.setData(0, self.ROLE_TOOLTIP, tooltip)
+                QToolTip.showText(event.globalPos(), tooltip, obj)
+            else:
+                QToolTip.hideText()
+                event.ignore()
+            return True
+        return super().eventFilter(obj, event)
 
     def _get_provider_config(self) -> str:
         """Get the current provider configuration."""
@@ -543,11 +709,13 @@ class EmbeddedPromptsPanel(QWidget):
             return
         
         data = item.data(0, Qt.UserRole)
+        dtype = data.get("type")
+        is_default = data.get("default", False)
         menu = QMenu()
         
-        if data.get("type") != "category":
+        if dtype != "category":
             menu.addAction(_("Replicate"), lambda: self._replicate_prompt())
-        if data.get("type") == "prompt" and not data.get("default", False):
+        if dtype == "prompt" and not is_default:
             menu.addAction(_("Rename"), lambda: self._rename_prompt(item))
             menu.addAction(_("Move Up"), lambda: self._move_prompt(item, up=True))
             menu.addAction(_("Move Down"), lambda: self._move_prompt(item, up=False))
@@ -565,9 +733,10 @@ class EmbeddedPromptsPanel(QWidget):
             return
         
         name = name.strip()
+        lowered = name.lower()
         # Check for duplicate name in the same category
         for prompt in self.prompts_data.get(category_name, []):
-            if prompt.get("name").lower() == name.lower():
+            if prompt.get("name").lower() == lowered:
                 QMessageBox.warning(self, _("Duplicate Prompt Name"),
                                    _("A prompt named '{}' already exists in category '{}'. Please choose a different name.").format(name, category_name))
                 return
@@ -588,9 +757,10 @@ class EmbeddedPromptsPanel(QWidget):
         self.prompts_data.setdefault(category_name, []).append(new_prompt)
         child = QTreeWidgetItem(category_item, [name])
         child.setData(0, Qt.UserRole, new_prompt)
+        self._prompt_items[new_id] = child
         category_item.setExpanded(True)
         self.tree.setCurrentItem(child)
-        self._save_to_file()
+        self._flush_timer.start()
 
     def _rename_prompt(self, item: QTreeWidgetItem) -> None:
         """Rename a prompt."""
@@ -600,16 +770,18 @@ class EmbeddedPromptsPanel(QWidget):
             return
         
         current_name = data.get("name")
-        category = item.parent().text(0)
+        category = self._category_of(item)
         new_name, ok = QInputDialog.getText(self, _("Rename Prompt"), _("Enter new prompt name:"), text=current_name)
         
         if not ok or not new_name.strip():
             return
         
         new_name = new_name.strip()
+        lowered = new_name.lower()
+        pid = data.get("id")
         # Check for duplicate name in the same category
         for prompt in self.prompts_data.get(category, []):
-            if prompt.get("name").lower() == new_name.lower() and prompt.get("id") != data.get("id"):
+            if prompt.get("name").lower() == lowered and prompt.get("id") != pid:
                 QMessageBox.warning(self, _("Duplicate Prompt Name"),
                                    _("A prompt named '{}' already exists in category '{}'. Please choose a different name.").format(new_name, category))
                 return
@@ -617,8 +789,11 @@ class EmbeddedPromptsPanel(QWidget):
         data["name"] = new_name
         item.setText(0, new_name)
         item.setData(0, Qt.UserRole, data)
-        self._update_prompt_in_data(category, data)
-        self._save_to_file()
+        self._invalidate_tooltip(item)
+        prompts, index = self._prompt_slot(item)
+        if index >= 0:
+            prompts[index].update(data)
+        self._flush_timer.start()
 
     def _move_prompt(self, item: QTreeWidgetItem, up: bool = True) -> None:
         """Move a prompt up or down within its category."""
@@ -636,13 +811,12 @@ class EmbeddedPromptsPanel(QWidget):
         if new_index < 0 or new_index >= parent.childCount():
             return
         
+        prompts = self.prompts_data.get(self._category_of(item), [])
         parent.takeChild(index)
         parent.insertChild(new_index, item)
-        category = parent.text(0)
-        prompts = self.prompts_data.get(category, [])
         if index < len(prompts) and new_index < len(prompts):
             prompts.insert(new_index, prompts.pop(index))
-        self._save_to_file()
+        self._flush_timer.start()
 
     def _delete_prompt(self, item: QTreeWidgetItem) -> None:
         """Delete a prompt."""
@@ -656,20 +830,18 @@ class EmbeddedPromptsPanel(QWidget):
         if not parent:
             return
         
-        category = parent.text(0)
         reply = QMessageBox.question(self, _("Delete Prompt"), _("Delete prompt '{}'?").format(name),
                                      QMessageBox.Yes | QMessageBox.No)
         if reply == QMessageBox.Yes:
             prompt_id = data.get("id")
             if prompt_id in self.pending_changes:
                 del self.pending_changes[prompt_id]
-            prompts = self.prompts_data.get(category, [])
-            for i, prompt in enumerate(prompts):
-                if prompt.get("id") == data.get("id"):
-                    del prompts[i]
-                    break
+            prompts, index = self._prompt_slot(item)
+            if index >= 0:
+                del prompts[index]
+            self._forget_prompt_item(item)
             parent.removeChild(item)
-            self._save_to_file()
+            self._flush_timer.start()
 
     def _replicate_prompt(self) -> None:
         """Replicate the current prompt."""
@@ -690,25 +862,58 @@ class EmbeddedPromptsPanel(QWidget):
             return
         
         new_name = new_name.strip()
-        new_prompt = data.copy()
+        new_prompt = self.pending_changes.get(data.get("id"), data).copy()
         new_prompt.update({"name": new_name, "default": False, "id": str(uuid.uuid4())})
 
         parent_item = self.current_prompt_item.parent()
         if parent_item:
-            category = parent_item.text(0)
-            self.prompts_data.setdefault(category, []).append(new_prompt)
-            new_child = QTreeWidgetItem(parent_item, [new_name])
-            new_child.setData(0, Qt.UserRole, new_prompt)
-            new_child.setToolTip(0, self._create_prompt_tooltip(new_prompt))
-            parent_item.setExpanded(True)
+            new_child = self._replicate_prompts([(parent_item, new_prompt)])[0]
             self.tree.setCurrentItem(new_child)
-            self._save_to_file()
             QMessageBox.information(self, _("Replicated"), _("Prompt replicated."))
 
+    def _replicate_prompts(self, parents_and_prompts: List[Tuple[QTreeWidgetItem, Dict]]) -> List[QTreeWidgetItem]:
+        """Append prompts under their category items in one batch and save once."""
+        children_by_parent: Dict[int, Tuple[QTreeWidgetItem, List[QTreeWidgetItem]]] = {}
+        new_items = []
+        for parent_item, prompt in parents_and_prompts:
+            self.prompts_data.setdefault(self._category_of_parent(parent_item), []).append(prompt)
+            child = QTreeWidgetItem([prompt["name"]])
+            child.setData(0, Qt.UserRole, prompt)
+            self._prompt_items[prompt["id"]] = child
+            children_by_parent.setdefault(id(parent_item), (parent_item, []))[1].append(child)
+            new_items.append(child)
+        
+        self.tree.setUpdatesEnabled(False)
+        self.tree.blockSignals(True)
+        try:
+            for parent_item, children in children_by_parent.values():
+                parent_item.addChildren(children)
+                parent_item.setExpanded(True)
+        finally:
+            self.tree.blockSignals(False)
+            self.tree.setUpdatesEnabled(True)
+        self._flush_timer.start()
+        return new_items
+
     def _show_provider_info(self) -> None:
-        """Show the provider information dialog."""
-        dialog = ProviderInfoDialog(self)
-        dialog.exec_()
+        """Show the provider information dialog, reusing it after the first open."""
+        if self._provider_info_dialog is None:
+            self._provider_info_dialog = ProviderInfoDialog(self)
+            self._provider_info_dialog.destroyed.connect(self._on_provider_info_destroyed)
+        dialog = self._provider_info_dialog
+        dialog.show()
+        dialog.raise_()
+        dialog.activateWindow()
+
+    def _on_provider_info_destroyed(self) -> None:
+        """Release the cached provider dialog once Qt has deleted it."""
+        self._provider_info_dialog = None
+
+    def _on_plus_clicked(self) -> None:
+        """Shared slot for every category's plus button."""
+        item = self.sender().property("category_item")
+        if item is not None:
+            self._handle_plus_clicked(item)
 
     def _handle_plus_clicked(self, item: QTreeWidgetItem) -> None:
         """Handle plus button clicks for replicating prompts."""
@@ -718,7 +923,21 @@ class EmbeddedPromptsPanel(QWidget):
         else:  # This feature was removed - too many icons on the screen
             self._replicate_prompt()
             
-    def closeEvent(self, a0):
+    def _flush_pending_changes(self) -> None:
+        """Write any pending edits now instead of waiting for the save timer."""
+        self.save_timer.stop()
         self._update_pending_changes()  # Capture any unsaved editor text
-        self._apply_pending_changes()   # Save to prompts_data and file
-        super().closeEvent(a0)
\ No newline at end of file
+        self._apply_pending_changes()   # Save to prompts_data
+        if self._flush_timer.isActive():
+            self._flush_to_file()
+
+    def closeEvent(self, a0):
+        self._flush_pending_changes()
+        if self._provider_info_dialog is not None:
+            self._provider_info_dialog.close()
+            self._provider_info_dialog.deleteLater()
+        super().closeEvent(a0)
+
+    def hideEvent(self, a0):
+        self._flush_pending_changes()
+        super().hideEvent(a0)
\ No newline at end of file
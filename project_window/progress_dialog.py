@@ -1,18 +1,26 @@
-from PyQt5.QtWidgets import QDialog, QVBoxLayout, QTextEdit, QPushButton, QApplication
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QPlainTextEdit, QPushButton
 from PyQt5.QtGui import QTextCursor
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import QTimer
 
 class ProgressDialog(QDialog):
+    FLUSH_DELAY = 50  # ms; messages arriving within this window are appended together
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle(_("Summary Progress"))
         self.setMinimumSize(800, 300)
+        self._pending_messages = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.FLUSH_DELAY)
+        self._flush_timer.timeout.connect(self._flush_messages)
         self.init_ui()
 
     def init_ui(self):
         layout = QVBoxLayout(self)
-        self.text_edit = QTextEdit()
+        self.text_edit = QPlainTextEdit()
         self.text_edit.setReadOnly(True)
+        self.text_edit.setMaximumBlockCount(5000)  # Cap memory on very long runs
         self.text_edit.setPlaceholderText(_("Summary generation progress will appear here..."))
         layout.addWidget(self.text_edit)
         self.close_button = QPushButton(_("Close"))
@@ -21,10 +29,14 @@ class ProgressDialog(QDialog):
         self.setLayout(layout)
 
     def append_message(self, message):
-        cursor = self.text_edit.textCursor()
-        cursor.movePosition(QTextCursor.End)
-        self.text_edit.setTextCursor(cursor)
-        self.text_edit.insertPlainText(message + "\n")
+        self._pending_messages.append(message)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush_messages(self):
+        if not self._pending_messages:
+            return
+        self.text_edit.appendPlainText("\n".join(self._pending_messages))
+        self._pending_messages.clear()
+        self.text_edit.moveCursor(QTextCursor.End)
         self.text_edit.ensureCursorVisible()
-        self.text_edit.repaint()  # Force immediate redraw of the text edit
-        QApplication.processEvents()  # Process pending events to update GUI
@@ -1,23 +1,65 @@
 #!/usr/bin/env python3
+import hashlib
 import os
 import time
 import uuid
+from functools import lru_cache
 from typing import Optional
-from PyQt5.QtCore import pyqtSignal, QObject
+from PyQt5.QtCore import pyqtSignal, QObject, QTimer
 from . import project_settings_manager as psm
 from settings.settings_manager import WWSettingsManager
 from settings.autosave_manager import load_latest_autosave, save_scene, get_latest_autosave_path
-from .tree_manager import load_structure, save_structure, update_structure_from_tree, get_structure_file_path
+from .tree_manager import load_structure, save_structure, serialize_structure, update_structure_from_tree, get_structure_file_path
+
+@lru_cache(maxsize=256)
+def _read_summary_file(path: str, mtime_ns: int) -> str:
+    """Read a summary file minus its UUID comment; mtime_ns ties the cached text to the file version."""
+    with open(path, "r", encoding="utf-8") as f:
+        content = f.read()
+    if content.startswith("<!-- UUID:"):
+        content = content.partition("\n")[2]
+    return content
+
+def _iter_children(node):
+    """Yield a node's chapters and scenes without building a combined list."""
+    yield from node.get("chapters", ())
+    yield from node.get("scenes", ())
+
+def _walk(*roots):
+    """Yield the given nodes and all of their descendants, depth first."""
+    stack = list(roots)
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(_iter_children(node))
+
+@lru_cache(maxsize=1024)
+def _sanitize_cached(name: str) -> str:
+    return WWSettingsManager.sanitize(name)
 
 class ProjectModel(QObject):
     """Manages project data and persistence."""
     structureChanged = pyqtSignal(list, str)
     errorOccurred = pyqtSignal(str)
+    SAVE_DELAY = 200  # ms; folds a burst of structure edits into one write
+    SETTINGS_SAVE_DELAY = 500  # ms; folds quick POV/tense changes into one settings write
 
     def __init__(self, project_name):
         super().__init__()
         self.project_name = project_name
+        self._sanitized_project = WWSettingsManager.sanitize(project_name)
         self.structure = load_structure(project_name)
+        self._last_saved_hash = None  # Digest of the structure as last written
+        self._uuid_index = None  # uuid -> node, built on first lookup
+        self._path_index = None  # (act, chapter, scene) name tuple -> node, built on first lookup
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(self.SAVE_DELAY)
+        self._save_timer.timeout.connect(self.save_structure)
+        self._settings_save_timer = QTimer(self)
+        self._settings_save_timer.setSingleShot(True)
+        self._settings_save_timer.setInterval(self.SETTINGS_SAVE_DELAY)
+        self._settings_save_timer.timeout.connect(self.save_settings)
         self.migrate_legacy_content()
         self.settings = self.load_settings()
         self.autosave_enabled = WWSettingsManager.get_setting("general", "enable_autosave", False)
@@ -32,30 +74,52 @@ class ProjectModel(QObject):
             "global_tense": settings.get("global_tense", _("Present Tense"))
         }
 
+    def schedule_settings_save(self):
+        """Save the settings after SETTINGS_SAVE_DELAY, restarting the delay on every call."""
+        self._settings_save_timer.start()
+
     def save_settings(self):
+        self._settings_save_timer.stop()
         psm.save_project_settings(self.project_name, self.settings)
 
     def update_structure(self, tree):
         old_structure = self.structure
-        self.structure = update_structure_from_tree(tree, self.project_name)
-        def merge_fields(old_node, new_node):
-            if old_node.get("uuid") == new_node.get("uuid"):
-                if "latest_file" in old_node:
-                    new_node["latest_file"] = old_node["latest_file"]
-                if "has_summary" in old_node:
-                    new_node["has_summary"] = old_node["has_summary"]
-                if "summary" in old_node:
-                    new_node["summary"] = old_node["summary"]
-            for key in ["chapters", "scenes"]:
-                if key in old_node and key in new_node:
-                    for old_child, new_child in zip(old_node[key], new_node[key]):
-                        merge_fields(old_child, new_child)
-        for old_act, new_act in zip(old_structure.get("acts", []), self.structure.get("acts", [])):
-            merge_fields(old_act, new_act)
-        self.save_structure()
+        self.structure = update_structure_from_tree(tree, self.project_name, self._find_node_by_uuid)
+        # Match nodes by uuid rather than position so moved nodes keep their files
+        old_by_uuid = {node["uuid"]: node for node in self._iter_nodes(old_structure) if "uuid" in node}
+        for new_node in self._iter_nodes():
+            old_node = old_by_uuid.get(new_node.get("uuid"))
+            if old_node is None:
+                continue
+            new_node.pop("summary_is_path", None)  # Only trust the flag alongside the summary it describes
+            for key in ("latest_file", "has_summary", "summary", "summary_is_path"):
+                if key in old_node:
+                    new_node[key] = old_node[key]
+        self._last_saved_hash = None  # update_structure_from_tree has already rewritten the file
+        self._uuid_index = None
+        self._path_index = None
+        self.schedule_save()
+
+    def schedule_save(self):
+        """Save the structure after SAVE_DELAY, restarting the delay on every call."""
+        self._save_timer.start()
 
     def save_structure(self):
-        save_structure(self.project_name, self.structure)
+        """Write the structure now, skipping the write if it matches what is on disk."""
+        self._save_timer.stop()
+        data = serialize_structure(self.structure)  # Hashed and written, so serialized only once
+        digest = hashlib.blake2b(data.encode("utf-8")).digest()
+        if digest == self._last_saved_hash:
+            return
+        if save_structure(self.project_name, self.structure, data):
+            self._last_saved_hash = digest
+
+    def flush(self):
+        """Write pending structure and settings saves immediately, e.g. before the window closes."""
+        if self._save_timer.isActive():
+            self.save_structure()
+        if self._settings_save_timer.isActive():
+            self.save_settings()
 
     def load_autosave(self, hierarchy, node: Optional[dict]=None):
         return load_latest_autosave(self.project_name, hierarchy, node)
@@ -74,12 +138,10 @@ class ProjectModel(QObject):
                     del node["content"]
             if "summary" in node:
                 node["has_summary"] = not node["summary"].startswith("This is the summary")
-            if "chapters" in node:
-                for i, chapter in enumerate(node["chapters"]):
-                    traverse_and_migrate(chapter, hierarchy + [chapter["name"]])
-            if "scenes" in node:
-                for i, scene in enumerate(node["scenes"]):
-                    traverse_and_migrate(scene, hierarchy + [scene["name"]])
+            for child in _iter_children(node):
+                traverse_and_migrate(child, hierarchy + [child["name"]])
+        if not any(self._needs_migration(node) for node in self._iter_nodes()):
+            return  # Nothing legacy left; don't touch the structure file
         file_path = get_structure_file_path(self.project_name)
         backup_path = file_path + ".backup"
         if os.path.exists(backup_path):
@@ -92,6 +154,14 @@ class ProjectModel(QObject):
         if os.path.exists(backup_path):
             self.save_structure()
 
+    @staticmethod
+    def _needs_migration(node):
+        return "content" in node or ("summary" in node and "has_summary" not in node)
+
+    def _iter_nodes(self, structure=None):
+        """Iterate over every act, chapter and scene in structure (default: the project's)."""
+        return _walk(*(structure if structure is not None else self.structure).get("acts", ()))
+
     def load_scene_content(self, hierarchy) -> Optional[str]:
         node = self._get_node_by_hierarchy(hierarchy)
         if not node:
@@ -104,15 +174,15 @@ class ProjectModel(QObject):
             if filepath:
                 del node["content"]
                 node["latest_file"] = filepath
-                self.save_structure()
+                self.schedule_save()
                 self.structureChanged.emit(hierarchy, uuid_val)
         elif content and "latest_file" not in node:
             latest_autosave = get_latest_autosave_path(self.project_name, hierarchy)
             if latest_autosave:
                 node["latest_file"] = latest_autosave
-                self.save_structure()
+                self.schedule_save()
         if content and content.startswith("<!-- UUID:"):
-            content = "\n".join(content.split("\n")[1:])
+            content = content.partition("\n")[2]
         return content
 
     def save_scene(self, hierarchy, content, expected_project_name: Optional[str]=None):
@@ -125,7 +195,7 @@ class ProjectModel(QObject):
             if "content" in node:
                 del node["content"]
             node["latest_file"] = filepath
-            self.save_structure()
+            self.schedule_save()
             self.structureChanged.emit(hierarchy, uuid_val)
         return filepath
     
@@ -136,10 +206,11 @@ class ProjectModel(QObject):
         uuid_val = node.setdefault("uuid", str(uuid.uuid4()))
         try:
             node["summary"] = summary_text
+            node["summary_is_path"] = False
             node["has_summary"] = bool(summary_text.strip())
             if not summary_text.strip():
                 self.errorOccurred.emit(_("Warning: Saved empty summary for {}. Use 'Delete Summary' to clear it.").format("/".join(hierarchy)))
-            self.save_structure()
+            self.schedule_save()
             self.last_saved_hierarchy = hierarchy
             self.structureChanged.emit(hierarchy, uuid_val)
             return True
@@ -165,10 +236,9 @@ class ProjectModel(QObject):
         uuid_val = node.setdefault("uuid", str(uuid.uuid4()))
 
         # Generate a unique filename for the summary
-        sanitized_project_name = WWSettingsManager.sanitize(self.project_name)
-        sanitized_hierarchy = "-".join(WWSettingsManager.sanitize(h) for h in hierarchy)
+        sanitized_hierarchy = "-".join(map(_sanitize_cached, hierarchy))
         timestamp = time.strftime("%Y%m%d%H%M%S")
-        filename = f"{sanitized_project_name}-{sanitized_hierarchy}-Summary_{timestamp}.html"
+        filename = f"{self._sanitized_project}-{sanitized_hierarchy}-Summary_{timestamp}.html"
         filepath = WWSettingsManager.get_project_relpath(self.project_name, filename)
 
         # Embed UUID in the summary content
@@ -180,9 +250,10 @@ class ProjectModel(QObject):
             # Update the structure to reference the file instead of storing the text
             if "summary" in node:
                 del node["summary"]
+            node.pop("summary_is_path", None)
 
             node["latest_file"] = filepath  # Track latest summary file
-            self.save_structure()
+            self.schedule_save()
             self.last_saved_hierarchy = hierarchy
             self.structureChanged.emit(hierarchy, uuid_val)
             return filepath
@@ -198,7 +269,8 @@ class ProjectModel(QObject):
         uuid_val = node.get("uuid")
         node["has_summary"] = False
         del node["summary"]
-        self.save_structure()
+        node.pop("summary_is_path", None)
+        self.schedule_save()
         self.structureChanged.emit(hierarchy, uuid_val)
         return True
 
@@ -209,12 +281,16 @@ class ProjectModel(QObject):
             raise ValueError(_("Either uuid or hierarchy must be provided"))
         node = None
         if uuid:
-            node = self._find_node_by_uuid(self.structure.get("acts", []), uuid)
+            node = self._find_node_by_uuid(uuid)
         elif hierarchy:
             node = self._get_node_by_hierarchy(hierarchy)
         if node and "summary" in node and node.get("has_summary", False):
             summary = node["summary"]
-            if WWSettingsManager.is_project_file_path(summary):
+            is_path = node.get("summary_is_path")
+            if is_path is None:
+                # Legacy node: classify once and keep the answer with the node
+                is_path = node["summary_is_path"] = WWSettingsManager.is_project_file_path(summary)
+            if is_path:
                 return self._load_summary_from_file(node, summary)
             if summary.strip() and len(summary.strip()) >= 10:
                 return summary
@@ -226,29 +302,40 @@ class ProjectModel(QObject):
     def _load_summary_from_file(self, node: dict, summary_file:Optional[str] = None):
         if not summary_file:
             summary_file = node.get("latest_file", '')
-        if summary_file and os.path.exists(summary_file):
-            try:
-                with open(summary_file, "r", encoding="utf-8") as f:
-                    content = f.read()
-                    # Strip UUID comment
-                    if content.startswith("<!-- UUID:"):
-                        content = "\n".join(content.split("\n")[1:])
-                    return content
-            except Exception as e:
-                print(f"Error loading summary from {summary_file}: {e}")
-                return None
-        return None
+        if not summary_file:
+            return None
+        try:
+            mtime_ns = os.stat(summary_file).st_mtime_ns
+        except OSError:
+            return None
+        try:
+            return _read_summary_file(summary_file, mtime_ns)
+        except Exception as e:
+            print(f"Error loading summary from {summary_file}: {e}")
+            return None
 
     
-    def _find_node_by_uuid(self, nodes, target_uuid):
-        for node in nodes:
-            if node.get("uuid") == target_uuid:
-                return node
-            for child in node.get("chapters", []) + node.get("scenes", []):
-                result = self._find_node_by_uuid([child], target_uuid)
-                if result:
-                    return result
-        return None
+    def _index_uuids(self):
+        index = {}
+        for node in self._iter_nodes():
+            node_uuid = node.get("uuid")
+            if node_uuid:
+                index[node_uuid] = node
+        self._uuid_index = index
+        return index
+
+    def _find_node_by_uuid(self, target_uuid):
+        node = self._uuid_index.get(target_uuid) if self._uuid_index is not None else None
+        if node is None or node.get("uuid") != target_uuid:
+            # Nodes can gain a uuid lazily (setdefault), so rebuild once before giving up
+            node = self._index_uuids().get(target_uuid)
+        return node
+
+    def _forget_uuids(self, node):
+        if self._uuid_index is None:
+            return
+        for descendant in _walk(node):
+            self._uuid_index.pop(descendant.get("uuid"), None)
     
     def _check_duplicate_name(self, nodes, name, exclude_uuid=None):
         for node in nodes:
@@ -268,7 +355,11 @@ class ProjectModel(QObject):
             "chapters": []
         }
         self.structure.setdefault("acts", []).append(new_act)
-        self.save_structure()
+        if self._uuid_index is not None:
+            self._uuid_index[new_act["uuid"]] = new_act
+        if self._path_index is not None:
+            self._path_index.setdefault((act_name,), new_act)
+        self.schedule_save()
         self.structureChanged.emit([act_name], new_act["uuid"])
 
     def add_chapter(self, act_name, chapter_name):
@@ -285,7 +376,11 @@ class ProjectModel(QObject):
                     "scenes": []
                 }
                 act.setdefault("chapters", []).append(new_chapter)
-                self.save_structure()
+                if self._uuid_index is not None:
+                    self._uuid_index[new_chapter["uuid"]] = new_chapter
+                if self._path_index is not None:
+                    self._path_index.setdefault((act_name, chapter_name), new_chapter)
+                self.schedule_save()
                 self.structureChanged.emit([act_name, chapter_name], new_chapter["uuid"])
                 break
 
@@ -302,7 +397,11 @@ class ProjectModel(QObject):
                             "name": scene_name
                         }
                         chapter.setdefault("scenes", []).append(new_scene)
-                        self.save_structure()
+                        if self._uuid_index is not None:
+                            self._uuid_index[new_scene["uuid"]] = new_scene
+                        if self._path_index is not None:
+                            self._path_index.setdefault((act_name, chapter_name, scene_name), new_scene)
+                        self.schedule_save()
                         self.structureChanged.emit([act_name, chapter_name, scene_name], new_scene["uuid"])
                         break
                 break
@@ -320,48 +419,54 @@ class ProjectModel(QObject):
             return
         old_hierarchy = hierarchy.copy()
         node["name"] = new_name
-        self.save_structure()
+        self._path_index = None  # Every path under the renamed node has changed
+        self.schedule_save()
         new_hierarchy = old_hierarchy[:-1] + [new_name]
         self.structureChanged.emit(new_hierarchy, uuid_val)
 
     def _get_parent_nodes(self, hierarchy):
         if not hierarchy:
             return []
-        current = self.structure.get("acts", [])
-        for level, name in enumerate(hierarchy[:-1]):
-            for item in current:
-                if item.get("name") == name:
-                    current = item.get("chapters" if level == 0 else "scenes", [])
-                    break
-        return current
+        if len(hierarchy) == 1:
+            return self.structure.get("acts", [])
+        parent = self._get_node_by_hierarchy(hierarchy[:-1])
+        if parent is None:
+            return []
+        return parent.get("chapters" if len(hierarchy) == 2 else "scenes", [])
     
     def delete_node(self, hierarchy):
         node = self._get_node_by_hierarchy(hierarchy)
         uuid_val = node.get("uuid") or None
         parent, index = self._get_parent_and_index(hierarchy)
         if parent and index is not None:
-            parent.pop(index)
-            self.save_structure()
+            self._forget_uuids(parent.pop(index))
+            self._path_index = None
+            self.schedule_save()
             self.structureChanged.emit(hierarchy, uuid_val)
 
+    def _index_paths(self):
+        index = {}
+        stack = [((), self.structure.get("acts", []), "chapters")]
+        while stack:
+            prefix, nodes, child_key = stack.pop()
+            for node in nodes:
+                path = prefix + (node.get("name"),)
+                # The first sibling with a name wins, as in a top-down name search
+                if index.setdefault(path, node) is node:
+                    stack.append((path, node.get(child_key, ()), "scenes"))
+        self._path_index = index
+        return index
+
     def _get_node_by_hierarchy(self, hierarchy):
-        current = self.structure.get("acts", [])
-        for level, name in enumerate(hierarchy):
-            for item in current:
-                if item.get("name") == name:
-                    if level == len(hierarchy) - 1:
-                        return item
-                    current = item.get("chapters" if level == 0 else "scenes", [])
-                    break
-        return None
+        path = tuple(hierarchy)
+        node = self._path_index.get(path) if self._path_index is not None else None
+        if node is None:
+            # Nodes can be added or named outside the model's mutators, so rebuild once on a miss
+            node = self._index_paths().get(path)
+        return node
 
     def _get_parent_and_index(self, hierarchy):
-        current = self.structure.get("acts", [])
-        for level, name in enumerate(hierarchy[:-1]):
-            for item in current:
-                if item.get("name") == name:
-                    current = item.get("chapters" if level == 0 else "scenes", [])
-                    break
+        current = self._get_parent_nodes(hierarchy)
         for i, item in enumerate(current):
             if item.get("name") == hierarchy[-1]:
                 return current, i
@@ -1,12 +1,21 @@
+from functools import partial
 from gettext import pgettext
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QTreeWidget, QMenu, 
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QTreeWidget, QTreeWidgetItemIterator, QMenu, 
                              QMessageBox, QInputDialog, QHeaderView, QAbstractItemView)
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QSignalBlocker, QTimer
 from PyQt5.QtGui import QIcon, QFont, QBrush
 from . import tree_manager
 from . import project_structure_manager as psm
 from settings.theme_manager import ThemeManager
 
+CATEGORY_ICON_PATH = "assets/icons/book.svg"
+SCENE_ICON_PATH = "assets/icons/edit.svg"
+STATUS_ICON_PATHS = {
+    "To Do": "assets/icons/circle.svg",
+    "In Progress": "assets/icons/loader.svg",
+    "Final Draft": "assets/icons/check-circle.svg"
+}
+
 class ProjectTreeWidget(QWidget):
     """Left panel with the project structure tree."""
     
@@ -19,14 +28,31 @@ class ProjectTreeWidget(QWidget):
     
     # Reverse mapping for translating user selections back to English
     REVERSE_STATUS_MAP = {v: k for k, v in STATUS_MAP.items()}
+    STATUS_ACTIONS = tuple(STATUS_MAP.items())  # (English, translated) pairs in menu order
+
+    CATEGORY_ROLE = Qt.UserRole + 1  # "true" on act and chapter items, for styling
+    LEVEL_ROLE = Qt.UserRole + 2  # Depth of the item (0 act, 1 chapter, 2 scene), set in assign_item_icon
+    STATUS_ROLE = Qt.UserRole + 3  # Node status the status icon was drawn for, set in assign_item_icon
+    BULK_REFRESH_THRESHOLD = 20  # Above this many queued nodes one populate beats incremental syncs
     
     def __init__(self, controller, model):
         super().__init__()
         self.controller = controller
         self.model = model
         self.tree = QTreeWidget()
+        self._uuid_index = {}  # node uuid -> QTreeWidgetItem, rebuilt by populate
+        self._bold_font = QFont()  # Shared by every act and chapter row
+        self._bold_font.setBold(True)
+        self._category_brush = QBrush(ThemeManager.get_category_background_color())
+        self._status_icons = {}  # English status -> QIcon for _status_icons_tint
+        self._status_icons_tint = None
+        self._pending_refreshes = {}  # node uuid -> latest hierarchy, flushed by _refresh_timer
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(0)
+        self._refresh_timer.timeout.connect(self._flush_refreshes)
         self.init_ui()
-        self.model.structureChanged.connect(self.refresh_tree)
+        self.model.structureChanged.connect(self._on_structure_changed)
         self.model.errorOccurred.connect(self.show_error_message)
 
     def init_ui(self):
@@ -37,79 +63,164 @@ class ProjectTreeWidget(QWidget):
         self.tree.setHeaderLabels([_("Name"), _("Status")])
         self.tree.setColumnCount(2)
         self.tree.setIndentation(5)  # Reduced indentation for left-justified appearance
+        self.tree.setUniformRowHeights(True)  # Every row is one line of text plus an icon
         self.tree.headerItem().setToolTip(1, _("Status"))
         self.tree.header().setStretchLastSection(False)
         self.tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         self.tree.header().setSectionResizeMode(1, QHeaderView.ResizeMode.Fixed)
         self.tree.setColumnWidth(1, 40) # 30 + 10 for scroll bar
         self.tree.setContextMenuPolicy(Qt.CustomContextMenu)
+        # Built once and refilled on each right-click
+        self._context_menu = QMenu(self)
+        self._status_menu = QMenu(_("Set Scene Status"), self)
         self.tree.customContextMenuRequested.connect(self.show_context_menu)
         self.tree.currentItemChanged.connect(self.controller.tree_item_changed)
         self.populate()
 
     def populate(self):
         """Populate the tree with the project structure."""
-        tree_manager.populate_tree(self.tree, self.model.structure)
-        self.assign_all_icons()
+        # currentItemChanged stays live here: the controller autosaves the outgoing scene on it
+        self.tree.setUpdatesEnabled(False)
+        try:
+            self._uuid_index = {}
+            cat_icon, scene_icon = self._get_icon(CATEGORY_ICON_PATH), self._get_icon(SCENE_ICON_PATH)
+            tree_manager.populate_tree(self.tree, self.model.structure,
+                                       lambda item, level: self._on_item_created(item, level, cat_icon, scene_icon))
+        finally:
+            self.tree.setUpdatesEnabled(True)
+
+    def _on_item_created(self, item, level, cat_icon=None, scene_icon=None):
+        """Index and style an item as populate_tree creates it."""
+        self._uuid_index[item.data(0, Qt.UserRole)] = item
+        self.assign_item_icon(item, level, cat_icon, scene_icon)
+
+    def find_item_by_uuid(self, target_uuid):
+        """Return the tree item for a node uuid, or None if it is not in the tree."""
+        item = self._uuid_index.get(target_uuid)
+        if item is None:
+            return None
+        try:
+            if item.treeWidget() is self.tree:
+                return item
+        except RuntimeError:  # The underlying C++ item has already been deleted
+            pass
+        del self._uuid_index[target_uuid]
+        return None
+
+    def node_for_item(self, item):
+        """Return the model node for a tree item (items store only the node uuid)."""
+        return self.model._find_node_by_uuid(item.data(0, Qt.UserRole))
+
+    def invalidate_category_brush(self):
+        """Re-read the category background once, after a theme or setting change."""
+        self._category_brush = QBrush(ThemeManager.get_category_background_color())
+
+    def _get_icon(self, path):
+        """Return the icon at path tinted for the current theme (ThemeManager caches it)."""
+        return ThemeManager.get_tinted_icon(path, self.controller.icon_tint)
+
+    def _get_status_icon(self, status):
+        """Return the status column icon, rebuilding the status table only when the tint changes."""
+        rgba = self.controller.icon_tint.rgba()
+        if rgba != self._status_icons_tint:
+            self._status_icons = {s: self._get_icon(path) for s, path in STATUS_ICON_PATHS.items()}
+            self._status_icons_tint = rgba
+        icon = self._status_icons.get(status)
+        return icon if icon is not None else QIcon()
+
+    @staticmethod
+    def _set_icon(item, column, icon):
+        """Set an item icon unless it already shows the same one (QIcon has no equality for Qt to check)."""
+        if item.icon(column).cacheKey() != icon.cacheKey():
+            item.setIcon(column, icon)
 
     def update_scene_status_icon(self, item):
         """Update the status icon for a scene item."""
-        tint = self.controller.icon_tint
-        status = item.data(0, Qt.UserRole).get("status", "To Do")
-        icons = {
-            "To Do": "assets/icons/circle.svg",
-            "In Progress": "assets/icons/loader.svg",
-            "Final Draft": "assets/icons/check-circle.svg"
-        }
-        item.setIcon(1, ThemeManager.get_tinted_icon(icons.get(status, ""), tint) if status in icons else QIcon())
+        node = self.node_for_item(item)
+        status = node.get("status", "To Do") if node else "To Do"
+        self._set_icon(item, 1, self._get_status_icon(status))
         item.setText(1, "")
 
     def get_item_level(self, item):
         """Calculate the level of an item in the tree."""
+        level = item.data(0, self.LEVEL_ROLE)
+        if level is not None:
+            return level
         level = 0
         temp = item
         while temp.parent():
             level += 1
             temp = temp.parent()
+        item.setData(0, self.LEVEL_ROLE, level)  # Items only move among siblings, so the level is fixed
         return level
 
     def refresh_tree(self, hierarchy, uuid):
         """Refresh the tree structure based on the model's data."""
         self._sync_tree_with_structure(hierarchy, uuid)
 
+    def _on_structure_changed(self, hierarchy, uuid):
+        """Queue a refresh so a burst of model changes is applied in one event-loop pass."""
+        self._pending_refreshes.pop(uuid, None)  # Re-queue at the end, keeping the newest hierarchy
+        self._pending_refreshes[uuid] = hierarchy
+        if not self._refresh_timer.isActive():
+            self._refresh_timer.start()
+
+    def _flush_refreshes(self):
+        """Apply queued refreshes, rebuilding the tree once when there are many of them."""
+        pending, self._pending_refreshes = self._pending_refreshes, {}
+        if len(pending) > self.BULK_REFRESH_THRESHOLD:
+            self.populate()
+            return
+        for uuid, hierarchy in pending.items():
+            self._sync_tree_with_structure(hierarchy, uuid)
+
     def _sync_tree_with_structure(self, hierarchy, uuid):
         """Synchronize the tree with the project structure incrementally."""
-        def find_item_by_uuid(parent, target_uuid, level=0):
-            for i in range(parent.childCount()):
-                item = parent.child(i)
-                item_data = item.data(0, Qt.UserRole)
-                if item_data.get("uuid") == target_uuid:
-                    return item, level
-                found, found_level = find_item_by_uuid(item, target_uuid, level + 1)
-                if found:
-                    return found, found_level
-            return None, -1
-
         root = self.tree.invisibleRootItem()
-        item, level = find_item_by_uuid(root, uuid)
+        item = self.find_item_by_uuid(uuid)
         if item:
             node = self.model._get_node_by_hierarchy(hierarchy)
             if node:
+                if (item.text(0), item.data(0, self.STATUS_ROLE)) == (node["name"], node.get("status")):
+                    return  # e.g. a sibling moved; nothing shown for this item changed
                 item.setText(0, node["name"])
-                item.setData(0, Qt.UserRole, node)
-                self.assign_item_icon(item, level)
+                self.assign_item_icon(item, self.get_item_level(item))
             else:
                 parent = item.parent() or root
                 parent.removeChild(item)
+                del self._uuid_index[uuid]
         else:
-            self.populate()
-            new_item = self.find_item_by_hierarchy(hierarchy)
+            new_item = self._insert_item(hierarchy)
+            if new_item is None:
+                # Parent not in the tree (or node gone); fall back to a full rebuild
+                self.populate()
+                new_item = self.find_item_by_hierarchy(hierarchy)
             if new_item:
                 self.tree.setCurrentItem(new_item)
                 self.tree.scrollToItem(new_item, QAbstractItemView.PositionAtCenter)
 
+    def _insert_item(self, hierarchy):
+        """Add a single item for a node new to the model, returning it or None if its parent is missing."""
+        if not hierarchy:
+            return None
+        node = self.model._get_node_by_hierarchy(hierarchy)
+        parent = self.find_item_by_hierarchy(hierarchy[:-1]) if len(hierarchy) > 1 else self.tree.invisibleRootItem()
+        if node is None or parent is None:
+            return None
+        item = tree_manager.create_item(parent, node)
+        self._uuid_index[node["uuid"]] = item
+        self.assign_item_icon(item, len(hierarchy) - 1)
+        parent.setExpanded(True)
+        return item
+
     def find_item_by_hierarchy(self, hierarchy):
         """Find a tree item by its hierarchy path."""
+        if hierarchy:
+            # The model's path index and our uuid index turn this into two dict lookups
+            node = self.model._get_node_by_hierarchy(hierarchy)
+            item = self.find_item_by_uuid(node.get("uuid")) if node else None
+            if item is not None and item.text(0) == hierarchy[-1]:
+                return item
         current = self.tree.invisibleRootItem()
         for name in hierarchy:
             found = None
@@ -123,63 +234,72 @@ class ProjectTreeWidget(QWidget):
             current = found
         return current
 
-    def assign_item_icon(self, item, level):
-        """Assign an icon to a tree item based on its level and status."""
-        tint = self.controller.icon_tint
-        scene_data = item.data(0, Qt.UserRole) or {"name": item.text(0), "status": "To Do"}
-        # Create bold font for category items (Acts and Chapters)
-        bold_font = QFont()
-        bold_font.setBold(True)
+    def assign_item_icon(self, item, level, cat_icon=None, scene_icon=None):
+        """
+        Assign an icon to a tree item based on its level and status.
+
+        Bulk callers pass cat_icon/scene_icon resolved once, so a whole pass uses one tint.
+        """
+        item.setData(0, self.LEVEL_ROLE, level)
 
         if level < 2:  # Act or Chapter
-            item.setIcon(0, ThemeManager.get_tinted_icon("assets/icons/book.svg", tint))
+            self._set_icon(item, 0, cat_icon if cat_icon is not None else self._get_icon(CATEGORY_ICON_PATH))
             item.setText(1, "")  # No status for acts or chapters
             # Apply category styling
-            item.setBackground(0, QBrush(ThemeManager.get_category_background_color()))
-            item.setFont(0, bold_font)
-            item.setData(0, Qt.ItemDataRole.UserRole + 1, "true")  # Mark as category
+            item.setBackground(0, self._category_brush)
+            item.setFont(0, self._bold_font)
+            item.setData(0, self.CATEGORY_ROLE, "true")  # Mark as category
         else:  # Scene
-            item.setIcon(0, ThemeManager.get_tinted_icon("assets/icons/edit.svg", tint))
-            status = scene_data.get("status", "To Do")
-            icons = {
-                "To Do": "assets/icons/circle.svg",
-                "In Progress": "assets/icons/loader.svg",
-                "Final Draft": "assets/icons/check-circle.svg"
-            }
-            item.setIcon(1, ThemeManager.get_tinted_icon(icons.get(status, ""), tint) if status in icons else QIcon())
+            self._set_icon(item, 0, scene_icon if scene_icon is not None else self._get_icon(SCENE_ICON_PATH))
+            node = self.node_for_item(item)  # Only scenes need the node's data
+            status = node.get("status") if node else None
+            item.setData(0, self.STATUS_ROLE, status)
+            self._set_icon(item, 1, self._get_status_icon(status or "To Do"))
             item.setText(1, "")
 
     def assign_all_icons(self):
-        """Recursively assign icons to all items in the tree."""
-        def assign_icons_recursively(item, level=0):
-            self.assign_item_icon(item, level)
-            for i in range(item.childCount()):
-                assign_icons_recursively(item.child(i), level + 1)
-
-        for i in range(self.tree.topLevelItemCount()):
-            assign_icons_recursively(self.tree.topLevelItem(i))
+        """Assign icons to all items in the tree."""
+        updates_enabled = self.tree.updatesEnabled()
+        self.tree.setUpdatesEnabled(False)
+        blocker = QSignalBlocker(self.tree)
+        try:
+            assign_item_icon = self.assign_item_icon
+            get_item_level = self.get_item_level
+            cat_icon, scene_icon = self._get_icon(CATEGORY_ICON_PATH), self._get_icon(SCENE_ICON_PATH)
+            it = QTreeWidgetItemIterator(self.tree)
+            item = it.value()
+            while item:
+                assign_item_icon(item, get_item_level(item), cat_icon, scene_icon)
+                it += 1
+                item = it.value()
+        finally:
+            blocker.unblock()
+            self.tree.setUpdatesEnabled(updates_enabled)
 
     def show_context_menu(self, pos):
         """Display context menu for tree items."""
         item = self.tree.itemAt(pos)
-        menu = QMenu()
+        menu = self._context_menu
+        menu.clear()
         hierarchy = self.controller.get_item_hierarchy(item) if item else []
         if not item:
             menu.addAction(_("Add Act"), lambda: self.model.add_act(QInputDialog.getText(self, _("Add Act"), _("Enter act name:"))[0]))
         else:
-            menu.addAction(_("Rename"), lambda: psm.rename_item(self.controller, item))
-            menu.addAction(_("Delete"), lambda: self.model.delete_node(hierarchy))
-            menu.addAction(_("Move Up"), lambda: psm.move_item_up(self.controller, item))
-            menu.addAction(_("Move Down"), lambda: psm.move_item_down(self.controller, item))
+            menu.addAction(_("Rename"), partial(psm.rename_item, self.controller, item))
+            menu.addAction(_("Delete"), partial(self.model.delete_node, hierarchy))
+            menu.addAction(_("Move Up"), partial(psm.move_item_up, self.controller, item))
+            menu.addAction(_("Move Down"), partial(psm.move_item_down, self.controller, item))
             level = self.get_item_level(item)
             if level == 0:
-                menu.addAction(_("Add Chapter"), lambda: psm.add_chapter(self.controller, item))
+                menu.addAction(_("Add Chapter"), partial(psm.add_chapter, self.controller, item))
             elif level == 1:
-                menu.addAction(_("Add Scene"), lambda: psm.add_scene(self.controller, item))
+                menu.addAction(_("Add Scene"), partial(psm.add_scene, self.controller, item))
             if level >= 2:
-                status_menu = menu.addMenu(_("Set Scene Status"))
-                for english_status, translated_status in self.STATUS_MAP.items():
-                    status_menu.addAction(translated_status, lambda s=english_status: self.controller.set_scene_status(item, s))
+                status_menu = self._status_menu
+                status_menu.clear()
+                menu.addMenu(status_menu)
+                for english_status, translated_status in self.STATUS_ACTIONS:
+                    status_menu.addAction(translated_status, partial(self.controller.set_scene_status, item, english_status))
         menu.exec_(self.tree.viewport().mapToGlobal(pos))
 
     def show_error_message(self, message):
@@ -1,10 +1,10 @@
 import os
 import time
 import json
-import tiktoken
 import re
 import logging
 import threading
+from functools import lru_cache
 
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QSplitter, QLabel, QShortcut, 
                              QMessageBox, QInputDialog, QApplication, QDialog,
@@ -29,12 +29,7 @@ from settings.llm_api_aggregator import WWApiAggregator
 from settings.llm_worker import LLMWorker
 from settings.settings_manager import WWSettingsManager
 from settings.theme_manager import ThemeManager
-from workshop.workshop import WorkshopWindow
-from util.text_analysis_gui import TextAnalysisApp
-from util.web_llm import MainWindow
-from util.whisper_app import WhisperApp
-from util.ia_window import IAWindow
-from muse.prompts_window import PromptsWindow
+from util import llm_cache
 from .token_limit_dialog import TokenLimitDialog
 from gettext import pgettext
 import muse.prompt_handler as prompt_handler
@@ -53,6 +48,14 @@ for path in possible_paths:
 if plugin_path:
     os.environ["QT_QPA_PLATFORM_PLUGIN_PATH"] = plugin_path
 
+_HTML_SNIFF = re.compile(r"\s*<")  # Content starting with a tag is HTML; matching avoids copying it to lstrip
+
+@lru_cache(maxsize=4)
+def _get_encoding(encoding_name="cl100k_base"):
+    """Return a shared tiktoken Encoding, building each one only once per process."""
+    import tiktoken  # Deferred: only the token-limit path needs it
+    return tiktoken.get_encoding(encoding_name)
+
 class CustomPOVDialog(QDialog):
     """Dialog for entering a custom POV character name and description."""
     def __init__(self, parent=None):
@@ -103,7 +106,10 @@ class ProjectWindow(QMainWindow):
         self.unsaved_preview = False
         self.enhanced_window = compendium_window
         self.worker = None
+        self._response_cache_key = None  # Cache key of the reply being streamed, if it may be cached
+        self._pov_names = None  # Entries currently in the POV character dropdown
         self.last_sidebar_width = 250
+        self._qsettings = QSettings("MyCompany", "WritingwayProject")  # Opened once; read on start, written on close
         self.init_ui()
         self.setup_connections()
         self.read_settings()
@@ -168,10 +174,12 @@ class ProjectWindow(QMainWindow):
         right_vertical_splitter.addWidget(self.bottom_stack)
         right_vertical_splitter.setStretchFactor(0, 3)
         right_vertical_splitter.setStretchFactor(1, 1)
+        right_vertical_splitter.setSizes([450, 150])  # Initial 3:1 split, so Qt skips its equal-share pass
 
         self.main_splitter.addWidget(right_vertical_splitter)
         self.main_splitter.setStretchFactor(0, 1)
         self.main_splitter.setStretchFactor(1, 3)
+        self.main_splitter.setSizes([self.last_sidebar_width, 650])
         self.main_splitter.setHandleWidth(10)
         self.main_splitter.splitterMoved.connect(self.update_sidebar_width)
         self.setCentralWidget(main_widget)
@@ -181,82 +189,53 @@ class ProjectWindow(QMainWindow):
             self.last_sidebar_width = self.main_splitter.sizes()[0]
 
     def toggle_outline_view(self, show):
-        self.side_bar.setVisible(show)
-        if show:
-            self.side_bar.setCurrentWidget(self.project_tree)
-            self.editor_stack.setCurrentWidget(self.scene_editor)
-            self.bottom_stack.setVisible(True)
-            self.main_splitter.setSizes([self.last_sidebar_width, self.main_splitter.sizes()[1]])
-            self.main_splitter.setCollapsible(0, False)
-            self.left_widget.setMinimumWidth(250)
-            self.left_widget.setMaximumWidth(16777215)
-        else:
-            self.last_sidebar_width = self.main_splitter.sizes()[0]
-            self.main_splitter.setSizes([50, self.main_splitter.sizes()[1]])
-            self.main_splitter.setCollapsible(0, True)
-            self.left_widget.setMinimumWidth(50)
-            self.left_widget.setMaximumWidth(50)
-        self.activity_bar.outline_action.setChecked(show)
-        self.bottom_stack.setVisible(True)
+        self._toggle_panel(self.project_tree, self.scene_editor, self.activity_bar.outline_action, show)
 
     def toggle_search_view(self, show):
-        self.side_bar.setVisible(show)
-        if show:
-            self.side_bar.setCurrentWidget(self.search_panel)
-            self.editor_stack.setCurrentWidget(self.scene_editor)
-            self.main_splitter.setSizes([self.last_sidebar_width, self.main_splitter.sizes()[1]])
-            self.main_splitter.setCollapsible(0, False)
-            self.left_widget.setMinimumWidth(250)
-            self.left_widget.setMaximumWidth(16777215)
-        else:
-            self.last_sidebar_width = self.main_splitter.sizes()[0]
-            self.main_splitter.setSizes([50, self.main_splitter.sizes()[1]])
-            self.main_splitter.setCollapsible(0, True)
-            self.left_widget.setMinimumWidth(50)
-            self.left_widget.setMaximumWidth(50)
-        self.activity_bar.search_action.setChecked(show)
-        self.bottom_stack.setVisible(True)
+        self._toggle_panel(self.search_panel, self.scene_editor, self.activity_bar.search_action, show)
 
     def toggle_compendium_view(self, show):
-        self.side_bar.setVisible(show)
-        if show:
-            self.side_bar.setCurrentWidget(self.compendium_panel)
-            self.editor_stack.setCurrentWidget(self.compendium_editor)
-            self.main_splitter.setSizes([self.last_sidebar_width, self.main_splitter.sizes()[1]])
-            self.main_splitter.setCollapsible(0, False)
-            self.left_widget.setMinimumWidth(250)
-            self.left_widget.setMaximumWidth(16777215)
-        else:
-            self.last_sidebar_width = self.main_splitter.sizes()[0]
-            self.main_splitter.setSizes([50, self.main_splitter.sizes()[1]])
-            self.main_splitter.setCollapsible(0, True)
-            self.left_widget.setMinimumWidth(50)
-            self.left_widget.setMaximumWidth(50)
-        self.activity_bar.compendium_action.setChecked(show)
-        self.bottom_stack.setVisible(True)
+        self._toggle_panel(self.compendium_panel, self.compendium_editor, self.activity_bar.compendium_action, show)
 
     def toggle_prompts_view(self, show):
-        self.side_bar.setVisible(show)
-        if show:
-            self.side_bar.setCurrentWidget(self.prompts_panel)
-            self.editor_stack.setCurrentWidget(self.prompts_editor)
-            self.main_splitter.setSizes([self.last_sidebar_width, self.main_splitter.sizes()[1]])
-            self.main_splitter.setCollapsible(0, False)
-            self.left_widget.setMinimumWidth(250)
-            self.left_widget.setMaximumWidth(16777215)
-            self.bottom_stack.setVisible(False)
-        else:
-            self.last_sidebar_width = self.main_splitter.sizes()[0]
-            self.main_splitter.setSizes([50, self.main_splitter.sizes()[1]])
-            self.main_splitter.setCollapsible(0, True)
-            self.left_widget.setMinimumWidth(50)
-            self.left_widget.setMaximumWidth(50)
-            self.bottom_stack.setVisible(True)
-        self.activity_bar.prompts_action.setChecked(show)
+        self._toggle_panel(self.prompts_panel, self.prompts_editor, self.activity_bar.prompts_action, show,
+                           hide_bottom=True)
+
+    def _toggle_panel(self, panel, editor, action, show, hide_bottom=False):
+        """Show panel in the side bar with editor in the main area, or collapse the side bar.
+
+        Repaints are suspended while the splitter and width limits change, so a toggle lays out once.
+        hide_bottom hides the bottom stack while the panel is shown.
+        """
+        self.main_splitter.setUpdatesEnabled(False)
+        try:
+            self.side_bar.setVisible(show)
+            editor_width = self.main_splitter.sizes()[1]
+            if show:
+                self.side_bar.setCurrentWidget(panel)
+                self.editor_stack.setCurrentWidget(editor)
+                self.main_splitter.setSizes([self.last_sidebar_width, editor_width])
+                self.main_splitter.setCollapsible(0, False)
+                self.left_widget.setMinimumWidth(250)
+                self.left_widget.setMaximumWidth(16777215)
+            else:
+                self.last_sidebar_width = self.main_splitter.sizes()[0]
+                self.main_splitter.setSizes([50, editor_width])
+                self.main_splitter.setCollapsible(0, True)
+                self.left_widget.setMinimumWidth(50)
+                self.left_widget.setMaximumWidth(50)
+            self.bottom_stack.setVisible(not (show and hide_bottom))
+            action.setChecked(show)
+        finally:
+            self.main_splitter.setUpdatesEnabled(True)
 
     def setup_status_bar(self):
         self.setStatusBar(self.statusBar())
         self.word_count_label = QLabel(_("Words: {}").format(0))
+        self.word_count_timer = QTimer(self)  # Recount once typing pauses instead of on every keystroke
+        self.word_count_timer.setSingleShot(True)
+        self.word_count_timer.setInterval(300)
+        self.word_count_timer.timeout.connect(self.update_word_count)
         self.last_save_label = QLabel(_("Last Saved: {}").format("Never"))
         self.statusBar().addPermanentWidget(self.word_count_label)
         self.statusBar().addPermanentWidget(self.last_save_label)
@@ -288,7 +267,7 @@ class ProjectWindow(QMainWindow):
                 return
         else:
             self.model.settings["global_pov_character"] = value
-            self.model.save_settings()
+            self.model.schedule_settings_save()
         self.update_setting_tooltips()
 
     def add_character_to_compendium(self, name, description):
@@ -302,24 +281,21 @@ class ProjectWindow(QMainWindow):
             except Exception as e:
                 print(f"Error loading compendium: {e}")
         
-        # Find or create Characters category
-        characters_cat = None
-        for cat in compendium_data.get("categories", []):
-            if cat.get("name", "").lower() == "characters":
-                characters_cat = cat
-                break
+        # Find or create Characters category (reversed so the first match wins, as before)
+        cats_by_name = {cat.get("name", "").lower(): cat for cat in reversed(compendium_data.get("categories", []))}
+        characters_cat = cats_by_name.get("characters")
         if not characters_cat:
             characters_cat = {"name": "Characters", "entries": []}
             compendium_data["categories"].append(characters_cat)
         
-        # Check if character already exists
-        for entry in characters_cat.get("entries", []):
-            if entry.get("name") == name:
-                entry["content"] = description
-                break
+        # Update the character if it already exists, otherwise add a new entry
+        entries = characters_cat.setdefault("entries", [])
+        entries_by_name = {entry.get("name"): entry for entry in reversed(entries)}
+        entry = entries_by_name.get(name)
+        if entry is not None:
+            entry["content"] = description
         else:
-            # Add new character entry
-            characters_cat["entries"].append({"name": name, "content": description})
+            entries.append({"name": name, "content": description})
         
         # Ensure extensions section exists
         if "extensions" not in compendium_data:
@@ -331,10 +307,17 @@ class ProjectWindow(QMainWindow):
         if name not in compendium_data["extensions"]["entries"]:
             compendium_data["extensions"]["entries"][name] = {"details": "", "tags": [], "relationships": [], "images": []}
         
-        # Save compendium
+        # Save compendium: serialize once, write a temp file and swap it in so a failed write never truncates it.
+        # Written synchronously so it cannot race the other compendium.json writers.
+        tmp_path = compendium_path + ".tmp"
         try:
-            with open(compendium_path, "w", encoding="utf-8") as f:
-                json.dump(compendium_data, f, indent=2)
+            # indent=2 like the compendium panel and enhanced window, so the file's format does not depend on the last writer
+            data_bytes = json.dumps(compendium_data, indent=2, ensure_ascii=False).encode("utf-8")
+            with open(tmp_path, "wb", buffering=1 << 20) as f:
+                f.write(data_bytes)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, compendium_path)
             # Update the compendium panel
             self.compendium_panel.populate_compendium()
             # Notify EnhancedCompendiumWindow
@@ -380,13 +363,14 @@ class ProjectWindow(QMainWindow):
                     self.project_tree.tree.setCurrentItem(chapter_item.child(0))
 
     def start_autosave_timer(self):
+        # Armed by the first edit after a save (see on_editor_text_changed), so an idle window never autosaves
         self.autosave_timer = QTimer(self)
+        self.autosave_timer.setSingleShot(True)
         self.autosave_timer.setInterval(300000)
         self.autosave_timer.timeout.connect(self.autosave_scene)
-        self.autosave_timer.start()
 
     def read_settings(self):
-        settings = QSettings("MyCompany", "WritingwayProject")
+        settings = self._qsettings
         geometry = settings.value(f"{self.model.project_name}/geometry")
         if geometry:
             self.restoreGeometry(geometry)
@@ -398,7 +382,7 @@ class ProjectWindow(QMainWindow):
             self.main_splitter.restoreState(splitterState)
 
     def write_settings(self):
-        settings = QSettings("MyCompany", "WritingwayProject")
+        settings = self._qsettings
         settings.setValue(f"{self.model.project_name}/geometry", self.saveGeometry())
         settings.setValue(f"{self.model.project_name}/windowState", self.saveState())
         if hasattr(self, "main_splitter"):
@@ -410,6 +394,7 @@ class ProjectWindow(QMainWindow):
             return
         if hasattr(self, 'autosave_timer') and self.autosave_timer.isActive():
             self.autosave_timer.stop()
+        self.model.flush()
         self.write_settings()
         a0.accept()
 
@@ -447,7 +432,7 @@ class ProjectWindow(QMainWindow):
         hierarchy = self.get_item_hierarchy(current)
         if level >= 2:
             content = self.model.load_scene_content(hierarchy)
-            if content and content.lstrip().startswith("<"):
+            if content and _HTML_SNIFF.match(content):
                 editor.setHtml(content)
             elif content:
                 editor.setPlainText(content)
@@ -457,7 +442,7 @@ class ProjectWindow(QMainWindow):
             self.bottom_stack.stack.setCurrentIndex(1)
         else:
             content = self.model.load_summary(hierarchy)
-            if content and content.lstrip().startswith("<"):
+            if content and _HTML_SNIFF.match(content):
                 editor.setHtml(content)
             elif content:
                 editor.setPlainText(content)
@@ -472,8 +457,9 @@ class ProjectWindow(QMainWindow):
         hierarchy = []
         current = item
         while current:
-            hierarchy.insert(0, current.text(0).strip())
+            hierarchy.append(current.text(0).strip())
             current = current.parent()
+        hierarchy.reverse()  # Collected leaf-first
         return hierarchy
     
     def get_current_scene_hierarchy(self):
@@ -487,9 +473,10 @@ class ProjectWindow(QMainWindow):
 
     def set_scene_status(self, item, new_status):
         english_status = ProjectTreeWidget.REVERSE_STATUS_MAP.get(new_status, new_status)
-        scene_data = item.data(0, Qt.UserRole) or {"name": item.text(0)}
-        scene_data["status"] = english_status
-        item.setData(0, Qt.UserRole, scene_data)
+        node = self.project_tree.node_for_item(item)
+        if node is None:
+            return
+        node["status"] = english_status
         self.project_tree.assign_item_icon(item, self.project_tree.get_item_level(item))
         self.model.update_structure(self.project_tree.tree)
 
@@ -515,6 +502,8 @@ class ProjectWindow(QMainWindow):
             self.model.unsaved_changes = False
 
     def autosave_scene(self, current_item=None):
+        if not self.model.unsaved_changes:
+            return  # Nothing edited since the last save; skip serializing the document
         if not current_item:
             current_item = self.project_tree.tree.currentItem()
         if not current_item or self.project_tree.get_item_level(current_item) < 2:
@@ -586,7 +575,7 @@ class ProjectWindow(QMainWindow):
                 return
         self.model.settings["global_pov"] = value
         self.update_setting_tooltips()
-        self.model.save_settings()
+        self.model.schedule_settings_save()
 
     def handle_tense_change(self, index):
         value = self.bottom_stack.tense_combo.currentText()
@@ -601,7 +590,7 @@ class ProjectWindow(QMainWindow):
                 return
         self.model.settings["global_tense"] = value
         self.update_setting_tooltips()
-        self.model.save_settings()
+        self.model.schedule_settings_save()
 
     def update_setting_tooltips(self):
         self.bottom_stack.pov_combo.setToolTip(_("POV: {}").format(self.model.settings['global_pov']))
@@ -627,6 +616,15 @@ class ProjectWindow(QMainWindow):
         self.bottom_stack.preview_text.setReadOnly(True)
         QApplication.processEvents()
         self.stop_llm()
+        resolved = WWApiAggregator.resolve_overrides(overrides)  # Key on the model really used, not "Default Model"
+        cache_key = llm_cache.make_key(final_prompt.to_string(), resolved) if llm_cache.is_cacheable(resolved) else None
+        cached = llm_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            # Deterministic request already answered; replay the reply without calling the LLM
+            self.update_text(cached)
+            self.on_finished()
+            return
+        self._response_cache_key = cache_key
         self.worker = LLMWorker(final_prompt, overrides)
         self.worker.data_received.connect(self.update_text)
         self.worker.finished.connect(self.on_finished)
@@ -634,12 +632,13 @@ class ProjectWindow(QMainWindow):
         self.worker.start()
 
     def handle_token_limit_error(self, error_msg):
+        self._response_cache_key = None
         self.bottom_stack.send_button.setEnabled(True)
         current_item = self.project_tree.tree.currentItem()
         level = self.project_tree.get_item_level(current_item) if current_item else -1
-        if current_item and level < 2 and current_item.data(0, Qt.UserRole).get("summary"):
-            summary = current_item.data(0, Qt.UserRole)["summary"]
-            self.retry_with_summary(summary)
+        node = self.project_tree.node_for_item(current_item) if current_item else None
+        if node and level < 2 and node.get("summary"):
+            self.retry_with_summary(node["summary"])
             return
         self.statusBar().showMessage(_("Generating summary to fit token limit…"))
         self.bottom_stack.summary_controller.create_summary()
@@ -661,6 +660,7 @@ class ProjectWindow(QMainWindow):
         )
         self.bottom_stack.preview_text.clear()
         self.bottom_stack.preview_text.setReadOnly(True)
+        self._response_cache_key = None  # Retries answer a different prompt than the one that was keyed
         self.worker = LLMWorker(final_prompt, prose_config)
         self.worker.data_received.connect(self.update_text)
         self.worker.finished.connect(self.on_finished)
@@ -684,7 +684,7 @@ class ProjectWindow(QMainWindow):
     def retry_with_truncated_story(self):
         full_text = self.scene_editor.editor.toPlainText()
         prose_config = self.bottom_stack.prose_prompt_panel.get_prompt()
-        encoding = tiktoken.get_encoding("cl100k_base")
+        encoding = _get_encoding()
         tokens = encoding.encode(full_text)
         max_tokens = prose_config.get("max_tokens", 2000) * 0.5
         truncated = encoding.decode(tokens[-int(max_tokens):])
@@ -725,9 +725,12 @@ class ProjectWindow(QMainWindow):
         self.bottom_stack.send_button.setEnabled(True)
         self.bottom_stack.preview_text.setReadOnly(False)
         raw_text = self.bottom_stack.preview_text.toPlainText()
+        cache_key, self._response_cache_key = self._response_cache_key, None
         if not raw_text.strip():
             QMessageBox.warning(self, _("LLM Response"), _("The LLM did not return any text. Possible token limit reached or an error occurred."))
             return
+        if cache_key and not raw_text.startswith("Error: "):
+            llm_cache.put(cache_key, raw_text)
         formatted_text = re.sub(r"\*\*(.*?)\*\*", r"<b>\1</b>", raw_text)
         formatted_text = re.sub(r"\*(.*?)\*", r"<i>\1</i>", formatted_text)
         formatted_text = formatted_text.replace("\n", "<br>")
@@ -744,6 +747,7 @@ class ProjectWindow(QMainWindow):
                 WWApiAggregator.interrupt()
             self.bottom_stack.send_button.setEnabled(True)
             self.bottom_stack.preview_text.setReadOnly(False)
+            self._response_cache_key = None  # A stopped reply is incomplete; never cache it
             logging.debug("Calling cleanup_worker")
             self.cleanup_worker()
         except Exception as e:
@@ -867,19 +871,23 @@ class ProjectWindow(QMainWindow):
         self.scene_editor.editor.setPlainText(updated_text)
 
     def open_analysis_editor(self):
+        from util.text_analysis_gui import TextAnalysisApp
         current_text = self.scene_editor.editor.toPlainText()
         self.analysis_editor_window = TextAnalysisApp(parent=self, initial_text=current_text, save_callback=self.analysis_save_callback)
         self.analysis_editor_window.show()
 
     def open_web_llm(self):
+        from util.web_llm import MainWindow
         self.web_llm = MainWindow()
         self.web_llm.show()
 
     def open_whisper_app(self):
+        from util.whisper_app import WhisperApp
         self.whisper_app = WhisperApp(self)
         self.whisper_app.show()
 
     def open_ia_window(self):
+        from util.ia_window import IAWindow
         self.ia_window = IAWindow()
         self.ia_window.show()
 
@@ -891,6 +899,7 @@ class ProjectWindow(QMainWindow):
         self.toggle_compendium_view(not self.side_bar.isVisible() or self.side_bar.currentWidget() != self.compendium_panel)
 
     def open_prompts_window(self):
+        from muse.prompts_window import PromptsWindow
         prompts_window = PromptsWindow(self.model.project_name, self)
         prompts_window.finished.connect(self.repopulate_prompts)
         prompts_window.exec_()
@@ -899,6 +908,7 @@ class ProjectWindow(QMainWindow):
         self.bottom_stack.prose_prompt_panel.repopulate_prompts()
 
     def open_workshop(self):
+        from workshop.workshop import WorkshopWindow
         self.workshop_window = WorkshopWindow(self)
         self.workshop_window.show()
 
@@ -929,6 +939,9 @@ class ProjectWindow(QMainWindow):
         if not characters:
             characters = ["Alice", "Bob", "Charlie"]
         characters.append(_("Custom..."))
+        if characters == self._pov_names:
+            return  # Same names in the same order; keep the combo as it is
+        self._pov_names = characters
         self.bottom_stack.pov_character_combo.blockSignals(True)
         self.bottom_stack.pov_character_combo.clear()
         self.bottom_stack.pov_character_combo.addItems(characters)
@@ -957,10 +970,12 @@ class ProjectWindow(QMainWindow):
         self.bottom_stack.update_tint(self.icon_tint)
         self.activity_bar.update_tint(self.icon_tint)
         self.search_panel.update_tint(self.icon_tint)
+        self.project_tree.invalidate_category_brush()
         self.project_tree.assign_all_icons()
 
     def refresh_category_backgrounds(self):
         """Refresh category background colors when the setting changes."""
+        self.project_tree.invalidate_category_brush()
         self.project_tree.assign_all_icons()
 
     def change_theme(self, new_theme):
@@ -971,9 +986,14 @@ class ProjectWindow(QMainWindow):
         self.update_icons()
 
     def on_editor_text_changed(self):
+        self.word_count_timer.start()
+        self.model.unsaved_changes = True
+        if hasattr(self, 'autosave_timer') and not self.autosave_timer.isActive():
+            self.autosave_timer.start()
+
+    def update_word_count(self):
         text = self.scene_editor.editor.toPlainText()
         self.word_count_label.setText(_("Words: {}").format(len(text.split())))
-        self.model.unsaved_changes = True
 
     def on_preview_text_changed(self):
         preview_text = self.bottom_stack.preview_text.toPlainText().strip()
@@ -1,14 +1,21 @@
 import re
-import tiktoken
 from PyQt5.QtCore import Qt
 
 class SummaryModel:
     def __init__(self, project_name, max_tokens=16000, encoding_name="cl100k_base"):
         self.project_name = project_name
         self.max_tokens = max_tokens
-        self.encoding = tiktoken.get_encoding(encoding_name)
+        self.encoding_name = encoding_name
+        self._encoding = None  # Loaded on first use; importing tiktoken is slow
         self.structure = None  # Set by controller
 
+    @property
+    def encoding(self):
+        if self._encoding is None:
+            import tiktoken
+            self._encoding = tiktoken.get_encoding(self.encoding_name)
+        return self._encoding
+
     def optimize_text(self, html_content, max_tokens=None):
         """Convert HTML to optimized plain text for LLM, handling token limits."""
         from PyQt5.QtWidgets import QTextEdit
@@ -71,10 +78,10 @@ class SummaryModel:
         
         # Scene-level or no summary available, gather scene content
         if item.childCount() == 0:
-            data = item.data(0, Qt.UserRole)
             if len(hierarchy) < 2:  # Only gather content for scenes
                 return scene_data
-            text = load_latest_autosave(self.project_name, hierarchy) or data.get("content", "")
+            node = project_model._find_node_by_uuid(item.data(0, Qt.UserRole)) if project_model else None
+            text = load_latest_autosave(self.project_name, hierarchy) or (node or {}).get("content", "")
             if text.strip():
                 scene_data.append({
                     "name": item.text(0).strip(),
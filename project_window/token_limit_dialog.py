@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel, QTextEdit, QPushButton, QHBoxLayout, QMessageBox
 from PyQt5.QtCore import Qt, pyqtSignal
-import tiktoken
 
 class TokenLimitDialog(QDialog):
     """
@@ -31,7 +30,8 @@ class TokenLimitDialog(QDialog):
         self.error_message = error_message
         self.initial_summary = initial_summary
         self.max_tokens = max_tokens
-        self.encoding = tiktoken.get_encoding(encoding_name)
+        self.encoding_name = encoding_name
+        self.encoding = None  # Loaded only once a summary gets close to the limit
         self.init_ui()
 
     def init_ui(self):
@@ -74,9 +74,11 @@ class TokenLimitDialog(QDialog):
 
     def update_token_count(self):
         """Update the token count display based on the current text."""
-        text = self.summary_editor.toPlainText()
-        tokens = len(self.encoding.encode(text))
-        self.token_label.setText(_("Tokens: {}/{}"). format(tokens, self.max_tokens))
+        tokens, exact = self.count_tokens(self.summary_editor.toPlainText())
+        if exact:
+            self.token_label.setText(_("Tokens: {}/{}"). format(tokens, self.max_tokens))
+        else:
+            self.token_label.setText(_("Tokens: at most {}/{}").format(tokens, self.max_tokens))
         # Optional: Highlight if over limit
         if tokens > self.max_tokens:
             self.token_label.setStyleSheet("color: red;")
@@ -85,6 +87,22 @@ class TokenLimitDialog(QDialog):
             self.token_label.setStyleSheet("")
             self.use_button.setEnabled(True)
 
+    def count_tokens(self, text):
+        """
+        Count tokens in text, returning (count, exact).
+
+        Byte-level BPE never produces more tokens than the text has UTF-8 bytes, so while the
+        byte count is under the limit it is returned as an upper bound and tiktoken is skipped.
+        Otherwise the exact tiktoken count decides whether the summary may be used.
+        """
+        byte_count = len(text.encode("utf-8"))
+        if byte_count < self.max_tokens:
+            return byte_count, False
+        if self.encoding is None:
+            import tiktoken
+            self.encoding = tiktoken.get_encoding(self.encoding_name)
+        return len(self.encoding.encode(text)), True
+
     def on_use_summary(self):
         """Handle the 'Use This Summary' button click."""
         summary = self.summary_editor.toPlainText().strip()
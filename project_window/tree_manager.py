@@ -67,22 +67,45 @@ def load_structure(project_name):
         save_structure(project_name, structure)
     return structure
 
-def save_structure(project_name, structure):
-    """Save the given project structure to the file."""
+def serialize_structure(structure):
+    """Return the JSON text save_structure writes for structure."""
+    return json.dumps(structure, indent=4)
+
+def save_structure(project_name, structure, data=None):
+    """Save the given project structure to the file.
+
+    data may carry serialize_structure(structure) when the caller already has it.
+    The JSON is written to a temporary file and swapped in with os.replace,
+    so an interrupted save never leaves a truncated structure file behind.
+    """
     file_path = get_structure_file_path(project_name)
+    tmp_path = file_path + ".tmp"
     try:
         if not os.path.exists(os.path.dirname(file_path)):
             os.makedirs(os.path.dirname(file_path))
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(structure, f, indent=4)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data if data is not None else serialize_structure(structure))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+        return True
     except Exception as e:
         print("Error saving project structure:", e)
+        return False
 
-def populate_tree(tree, structure):
+def create_item(parent, node, default_name="Unnamed"):
+    """Create and append a tree item for node under parent (a QTreeWidget or QTreeWidgetItem)."""
+    item = QTreeWidgetItem(parent, [node.get("name", default_name)])
+    item.setData(0, Qt.UserRole, node["uuid"])  # The node itself stays in the model; look it up by uuid
+    return item
+
+def populate_tree(tree, structure, on_item_created=None):
     """
     Populate the provided QTreeWidget with the project structure.
     The structure is expected to contain "acts", each with "chapters" and "scenes".
     If a node is not a dict or lacks a "name" key, it is converted to a dict using its string value.
+    on_item_created, if given, is called as on_item_created(item, level) for each new item,
+    so callers can style items in the same pass.
     """
     def ensure_dict(node):
         if not isinstance(node, dict):
@@ -97,39 +120,56 @@ def populate_tree(tree, structure):
         return node
 
     tree.clear()
-    for act in structure.get("acts", []):
-        act = ensure_dict(act)
-        act_item = QTreeWidgetItem(tree, [act.get("name", "Unnamed Act")])
-        act_item.setData(0, Qt.UserRole, act)
-        for chapter in act.get("chapters", []):
-            chapter = ensure_dict(chapter)
-            chapter_item = QTreeWidgetItem(act_item, [chapter.get("name", "Unnamed Chapter")])
-            chapter_item.setData(0, Qt.UserRole, chapter)
-            for scene in chapter.get("scenes", []):
-                scene = ensure_dict(scene)
-                scene_item = QTreeWidgetItem(chapter_item, [scene.get("name", "Unnamed Scene")])
-                scene_item.setData(0, Qt.UserRole, scene)
+    acts = structure.get("acts", [])
+    for i, act in enumerate(acts):
+        # Write converted nodes back so every item's uuid resolves to a node in the structure
+        acts[i] = act = ensure_dict(act)
+        act_item = create_item(tree, act, "Unnamed Act")
+        if on_item_created:
+            on_item_created(act_item, 0)
+        chapters = act.get("chapters", [])
+        for j, chapter in enumerate(chapters):
+            chapters[j] = chapter = ensure_dict(chapter)
+            chapter_item = create_item(act_item, chapter, "Unnamed Chapter")
+            if on_item_created:
+                on_item_created(chapter_item, 1)
+            scenes = chapter.get("scenes", [])
+            for k, scene in enumerate(scenes):
+                scenes[k] = scene = ensure_dict(scene)
+                scene_item = create_item(chapter_item, scene, "Unnamed Scene")
+                if on_item_created:
+                    on_item_created(scene_item, 2)
     tree.expandAll()
 
-def update_structure_from_tree(tree, project_name):
+def update_structure_from_tree(tree, project_name, node_for_uuid):
     """
     Rebuild the project structure by traversing the QTreeWidget.
+    Items hold node uuids; node_for_uuid(uuid) returns the current node for each.
     Saves the updated structure and returns it.
     """
+    def node_copy(item):
+        # Shallow copy so the previous structure is left as it was; None if the model dropped the node
+        node = node_for_uuid(item.data(0, Qt.UserRole))
+        return dict(node) if node is not None else None
+
     structure = {"acts": []}
     root = tree.invisibleRootItem()
     for i in range(root.childCount()):
         act_item = root.child(i)
-        act = act_item.data(0, Qt.UserRole)
+        act = node_copy(act_item)
+        if act is None:
+            continue
         chapters = []
         for j in range(act_item.childCount()):
             chapter_item = act_item.child(j)
-            chapter = chapter_item.data(0, Qt.UserRole)
+            chapter = node_copy(chapter_item)
+            if chapter is None:
+                continue
             scenes = []
             for k in range(chapter_item.childCount()):
-                scene_item = chapter_item.child(k)
-                scene = scene_item.data(0, Qt.UserRole)
-                scenes.append(scene)
+                scene = node_copy(chapter_item.child(k))
+                if scene is not None:
+                    scenes.append(scene)
             chapter["scenes"] = scenes
             chapters.append(chapter)
         act["chapters"] = chapters
@@ -137,7 +177,7 @@ def update_structure_from_tree(tree, project_name):
     save_structure(project_name, structure)
     return structure
 
-def delete_node(tree, item, project_name):
+def delete_node(tree, item, project_name, node_for_uuid):
     """
     Deletes the specified item from the QTreeWidget and updates the project structure.
     Returns the updated structure.
@@ -153,5 +193,5 @@ def delete_node(tree, item, project_name):
         index = parent.indexOfChild(item)
         if index != -1:
             parent.takeChild(index)
-    new_structure = update_structure_from_tree(tree, project_name)
+    new_structure = update_structure_from_tree(tree, project_name, node_for_uuid)
     return new_structure
\ No newline at end of file
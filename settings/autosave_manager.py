@@ -40,6 +40,23 @@ def is_protected_backup(filepath: str) -> bool:
     except Exception:
         return False
 
+def _read_text_file(filepath: str) -> str:
+    """Read a UTF-8 text file with universal newlines, in one unbuffered read."""
+    with open(filepath, "rb", buffering=0) as f:
+        text = f.read().decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+def _strip_scene_header(content: str) -> str:
+    """Strip the leading UUID and PROTECTED comment lines from a scene file."""
+    while content:
+        first_line, _, rest = content.partition("\n")
+        if not (first_line.startswith("<!-- UUID:") or first_line == "<!-- PROTECTED -->"):
+            break
+        content = rest
+    return content
+
 def get_latest_autosave_path(project_name: str, hierarchy: list, uuid: Optional[str] = None) -> str | None:
     """
     Return the path to the most recent autosave file for a given scene that is suitable for the provided UUID.
@@ -115,13 +132,7 @@ def load_latest_autosave(project_name: str, hierarchy: list, node: Optional[dict
     if node and "latest_file" in node and os.path.exists(node["latest_file"]):
         filepath = node["latest_file"]
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                content = f.read()
-                # Strip UUID and PROTECTED comments
-                lines = content.split("\n")
-                while lines and (lines[0].startswith("<!-- UUID:") or lines[0] == "<!-- PROTECTED -->"):
-                    lines.pop(0)
-                return "\n".join(lines)
+            return _strip_scene_header(_read_text_file(filepath))
         except Exception as e:
             print(f"Error loading latest file {node['latest_file']}: {e}")
 
@@ -129,13 +140,7 @@ def load_latest_autosave(project_name: str, hierarchy: list, node: Optional[dict
     latest_file = get_latest_autosave_path(project_name, hierarchy, uuid=uuid_val)
     if latest_file:
         try:
-            with open(latest_file, "r", encoding="utf-8") as f:
-                content = f.read()
-                # Strip UUID and PROTECTED comments
-                lines = content.split("\n")
-                while lines and (lines[0].startswith("<!-- UUID:") or lines[0] == "<!-- PROTECTED -->"):
-                    lines.pop(0)
-                return "\n".join(lines)
+            return _strip_scene_header(_read_text_file(latest_file))
         except Exception as e:
             print(f"Error loading autosave file {latest_file}: {e}")
 
@@ -148,13 +153,7 @@ def load_latest_autosave(project_name: str, hierarchy: list, node: Optional[dict
             file_uuid = get_uuid_from_file(filepath)
             if file_uuid == uuid_val:
                 try:
-                    with open(filepath, "r", encoding="utf-8") as f:
-                        content = f.read()
-                        # Strip UUID and PROTECTED comments
-                        lines = content.split("\n")
-                        while lines and (lines[0].startswith("<!-- UUID:") or lines[0] == "<!-- PROTECTED -->"):
-                            lines.pop(0)
-                        return "\n".join(lines)
+                    return _strip_scene_header(_read_text_file(filepath))
                 except Exception as e:
                     print(f"Error loading autosave file {filepath}: {e}")
                 # Update node's latest_file if found
@@ -12,6 +12,8 @@ from .settings_manager import WWSettingsManager
 from .autosave_manager import build_scene_identifier
 from .theme_manager import ThemeManager
 
+_HTML_SNIFF = re.compile(r"\s*<")
+
 class BackupDialog(QDialog):
     """Dialog to display and manage backup files for a specific project item."""
     
@@ -236,7 +238,7 @@ class BackupDialog(QDialog):
             content = parent.model.load_summary(self.hierarchy)
             if content and isinstance(content, str):
                 # Convert summary content to plain text if it's HTML
-                if content.lstrip().startswith("<"):
+                if _HTML_SNIFF.match(content):
                     doc = QTextDocument()
                     doc.setHtml(content)
                     return doc.toPlainText()
@@ -19,6 +19,8 @@ import time  # Added for cache expiration
 DEFAULT_MAX_TOKENS = 1024
 DEFAULT_TEMPERATURE = 0.7
 MODEL_CACHE_TTL = 3600  # Cache TTL in seconds (1 hour)
+# Section header in prompt_handler's template; everything before it (system, context, story) is the stable prefix
+PROMPT_CACHE_BREAK = "### User"
 
 class LLMProviderBase(ABC):
     """Base class for all LLM providers."""
@@ -64,6 +66,10 @@ class LLMProviderBase(ABC):
     def get_llm_instance(self, overrides) -> Union[LLM, BaseChatModel]:
         """Returns a configured LLM instance."""
         pass
+
+    def prepare_prompt(self, final_prompt):
+        """Returns the prompt in the form this provider's LLM should receive it."""
+        return final_prompt
     
     def _do_models_request(self, url: str, headers: Dict[str, str] = None) -> List[str]:
         """Send a request to the provider to fetch available models."""
@@ -261,6 +267,18 @@ class AnthropicProvider(LLMProviderBase):
             timeout=self.get_timeout(overrides)
         )
     
+    def prepare_prompt(self, final_prompt):
+        """Mark the stable part of the prompt for Anthropic prompt caching, so repeated sends reuse its prefill."""
+        from langchain_core.messages import HumanMessage
+        text = final_prompt.to_string() if hasattr(final_prompt, "to_string") else str(final_prompt)
+        prefix, marker, rest = text.partition(PROMPT_CACHE_BREAK)
+        if not marker or not prefix.strip():
+            return final_prompt
+        return [HumanMessage(content=[
+            {"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": marker + rest},
+        ])]
+
     def _do_models_request(self, url: str, headers: Dict[str, str] = None) -> List[str]:
         """Send a request to the provider to fetch available models."""
         default_headers = {
@@ -710,6 +728,20 @@ class LLMAPIAggregator:
         """Dynamically returns a list of supported LLM provider names."""
         return [cls().provider_name for cls in LLMProviderBase.__subclasses__()]
     
+    def resolve_overrides(self, overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Return a copy of overrides naming the provider and model a prompt will actually be sent to."""
+        overrides = dict(overrides or {})
+        provider_name = overrides.get("provider") or WWSettingsManager.get_active_llm_name()
+        if provider_name in ["Local", "Default"]:
+            provider_name = WWSettingsManager.get_active_llm_name()
+            overrides = {}
+        overrides["provider"] = provider_name
+        provider = self.aggregator.get_provider(provider_name) if provider_name else None
+        # Same fallback as send_prompt_to_llm and stream_prompt_to_llm
+        if provider and overrides.get("model") in [None, "Default Model"]:
+            overrides["model"] = provider.get_current_model()
+        return overrides
+
     def send_prompt_to_llm(
         self, 
         final_prompt: str, 
@@ -756,7 +788,7 @@ class LLMAPIAggregator:
             response = llm.invoke(messages)
             return response.content
         else:
-            return llm.invoke(final_prompt).content
+            return llm.invoke(provider.prepare_prompt(final_prompt)).content
 
     def stream_prompt_to_llm(
         self, 
@@ -819,7 +851,7 @@ class LLMAPIAggregator:
                         break
                     yield chunk.content
             else:
-                stream = llm.stream(final_prompt)
+                stream = llm.stream(provider.prepare_prompt(final_prompt))
                 for chunk in stream:
                     if self.interrupt_flag.is_set():
                         logging.debug("Stream interrupted by flag")
@@ -1,4 +1,4 @@
-from PyQt5.QtCore import Qt, QSize, QObject, pyqtSignal
+from PyQt5.QtCore import Qt, QSize, QObject, QByteArray, pyqtSignal
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtGui import QIcon, QColor, QPixmap, QPainter
 from PyQt5.QtSvg import QSvgRenderer
@@ -21,6 +21,7 @@ class ThemeManager(QObject):
     
     _instance = None
     _icon_cache = {}  # Cache: (file_path, tint_color) -> QIcon
+    _svg_bytes = {}  # Preloaded SVG sources: file_path -> QByteArray
 
     def __new__(cls):
         if cls._instance is None:
@@ -839,15 +840,42 @@ class ThemeManager(QObject):
 
     @staticmethod
     def get_tinted_icon(file_path, tint_color=None, theme_name=None, size=None):
+        """
+        Return file_path's SVG tinted with tint_color.
+
+        Sources registered with preload_icons are rendered from memory; only
+        unknown paths touch the filesystem.
+        """
         theme = theme_name or ThemeManager._current_theme
         if tint_color is None:
             tint_color = ThemeManager.ICON_TINTS.get(theme)
-        cache_key = (file_path, str(tint_color) if isinstance(tint_color, QColor) else tint_color)
+        # QColor's str() is its object address, so key on the colour value instead
+        cache_key = (file_path, tint_color.rgba() if isinstance(tint_color, QColor) else tint_color)
 
         if cache_key in ThemeManager._icon_cache:
             return ThemeManager._icon_cache[cache_key]
 
-        renderer = QSvgRenderer(file_path)
+        raw = ThemeManager._svg_bytes.get(file_path)
+        renderer = QSvgRenderer(raw) if raw is not None else QSvgRenderer(file_path)
+        icon = ThemeManager._render_tinted_icon(renderer, tint_color, size)
+        if not icon.isNull():
+            ThemeManager._icon_cache[cache_key] = icon
+        return icon
+
+    @classmethod
+    def preload_icons(cls, file_paths):
+        """Read SVG sources into memory once so later tints skip the filesystem."""
+        for file_path in file_paths:
+            if file_path in cls._svg_bytes:
+                continue
+            try:
+                with open(file_path, "rb") as f:
+                    cls._svg_bytes[file_path] = QByteArray(f.read())
+            except OSError:
+                pass  # Missing icons fall back to get_tinted_icon's usual path
+
+    @staticmethod
+    def _render_tinted_icon(renderer, tint_color, size):
         if not renderer.isValid():
             return QIcon()
 
@@ -881,9 +909,7 @@ class ThemeManager(QObject):
 
             pixmap = tinted_pixmap
 
-        icon = QIcon(pixmap)
-        ThemeManager._icon_cache[cache_key] = icon
-        return icon
+        return QIcon(pixmap)
     
     @classmethod
     def calculate_contrast_ratio(cls, color1, color2):
@@ -0,0 +1,81 @@
+"""
+Exact-match cache for LLM replies.
+
+Only deterministic requests (temperature 0) are cached, since any other
+temperature is expected to give a different reply each time. Replies are kept
+in a small in-memory LRU in front of a shelve file, so repeated prompts are
+served without a network round trip, even after a restart.
+
+The shelve file holds at most DISK_ENTRIES replies; once full, the oldest
+quarter is dropped. Deleting the Projects/llm_cache* files clears it entirely.
+"""
+import os
+import json
+import time
+import shelve
+import hashlib
+from collections import OrderedDict
+
+MEMORY_ENTRIES = 256
+DISK_ENTRIES = 2000
+CACHE_FILE = os.path.join(os.getcwd(), "Projects", "llm_cache")
+
+_memory = OrderedDict()  # key -> reply, most recently used last
+
+def is_cacheable(overrides):
+    """Return True if a request with these overrides should give a repeatable reply."""
+    try:
+        return float((overrides or {}).get("temperature", 1)) == 0
+    except (TypeError, ValueError):
+        return False
+
+def make_key(prompt_text, overrides):
+    """
+    Build the cache key for a prompt and the provider/model settings it is sent with.
+
+    Pass overrides already resolved to the provider and model actually used, so a
+    "Default Model" entry does not match replies from a previously configured model.
+    """
+    payload = json.dumps({"prompt": prompt_text, "overrides": overrides or {}}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _remember(key, value):
+    _memory[key] = value
+    _memory.move_to_end(key)
+    if len(_memory) > MEMORY_ENTRIES:
+        _memory.popitem(last=False)
+
+def get(key):
+    """Return the cached reply for key, or None."""
+    value = _memory.get(key)
+    if value is not None:
+        _memory.move_to_end(key)
+        return value
+    try:
+        with shelve.open(CACHE_FILE, flag="r") as db:
+            entry = db.get(key)
+    except Exception:
+        return None  # No cache file yet, or it cannot be read
+    if entry is None:
+        return None
+    value = entry[1]
+    _remember(key, value)
+    return value
+
+def put(key, value):
+    """Store a reply under key in memory and on disk."""
+    _remember(key, value)
+    try:
+        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+        with shelve.open(CACHE_FILE) as db:
+            if key not in db and len(db) >= DISK_ENTRIES:
+                _evict_oldest(db, DISK_ENTRIES // 4)
+            db[key] = (time.time(), value)
+    except Exception as e:
+        print(f"Error saving LLM cache: {e}")
+
+def _evict_oldest(db, count):
+    """Delete the count entries stored longest ago from an open shelf."""
+    stamps = sorted((entry[0], key) for key, entry in db.items())
+    for stamp, key in stamps[:count]:
+        del db[key]
@@ -653,8 +653,9 @@ class WorkshopWindow(QDialog):
     def get_item_hierarchy(self, item):
         hierarchy = []
         while item:
-            hierarchy.insert(0, item.text(0))
+            hierarchy.append(item.text(0))
             item = item.parent()
+        hierarchy.reverse()  # Collected leaf-first
         return hierarchy
 
     def show_conversation_context_menu(self, pos: QPoint):